@@ -0,0 +1,187 @@
+# API HTTP (JSON) untuk skoring tanpa UI Streamlit, memakai pipeline yang sama
+# dengan halaman deteksi: codebook -> scaler -> titik rep terdekat.
+#
+#   python api.py [--host 127.0.0.1] [--port 8000] [--model cure_model.bundle]
+#
+#   GET  /health        info model yang sedang dipakai
+#   GET  /metrics       metrik format teks Prometheus (lihat metrics.py)
+#   POST /score         satu record (objek JSON dengan kolom seperti data.csv)
+#   POST /score/batch   {"records": [ {...}, ... ]}
+import argparse
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+import metrics
+from artifacts import cache_info
+from detection import load_model, score_batch
+from preprocessing import FEATURES
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_RECORDS = 10000
+# label metrik per route; path lain digabung jadi "other" agar jumlah seri tetap terbatas
+ROUTES = ('/health', '/metrics', '/score', '/score/batch')
+
+logger = logging.getLogger('malnutrisi.api')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, **detail):
+        super().__init__(message)
+        self.status = status
+        self.body = {'error': message, **detail}
+
+
+def _score_records(records, model_file):
+    if not records:
+        return [], {}
+    # nilai kolom harus skalar (teks/angka/null), bukan list atau objek
+    nested = sorted({kolom for record in records for kolom, nilai in record.items() if isinstance(nilai, (dict, list))})
+    if nested:
+        raise ApiError(400, "Nilai kolom harus berupa teks, angka atau null", columns=nested)
+    data = pd.DataFrame.from_records(records)
+    missing = [kolom for kolom in FEATURES if kolom not in data.columns]
+    if missing:
+        raise ApiError(400, "Kolom tidak ditemukan", missing=missing)
+
+    hasil, unknown = score_batch(data, load_model(model_file))
+    results = [
+        {
+            'nama': record.get('Nama'),
+            'cluster': None if pd.isna(klaster) else int(klaster),
+            'label': None if pd.isna(status) else status,
+            'intervensi': teks,
+        }
+        for record, klaster, status, teks in zip(records, hasil['Klaster'], hasil['Status'], hasil['Intervensi'])
+    ]
+    return results, {kolom: [str(v) for v in nilai] for kolom, nilai in unknown.items()}
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    model_file = 'cure_model.bundle'
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type='application/json; charset=utf-8'):
+        if isinstance(body, str):
+            payload = body.encode('utf-8')
+        else:
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise ApiError(400, "Content-Length tidak valid")
+        if length < 0:
+            raise ApiError(400, "Content-Length tidak valid")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "Body terlalu besar")
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            raise ApiError(400, "Body bukan JSON yang valid")
+
+    # ApiError -> status dan body-nya; error lain -> 500 agar klien tetap mendapat respons
+    def _respond(self, handle):
+        try:
+            handle()
+        except ApiError as e:
+            metrics.count(f'api_errors_{e.status}')
+            self._send(e.status, e.body)
+        except Exception:
+            logger.exception("Error saat memproses %s %s", self.command, self.path)
+            metrics.count('api_errors_500')
+            self._send(500, {'error': "Terjadi kesalahan di server"})
+
+    def do_GET(self):
+        self._respond(self._handle_get)
+
+    def _handle_get(self):
+        if self.route == '/metrics':
+            return self._send(200, metrics.prometheus_text(), 'text/plain; version=0.0.4; charset=utf-8')
+        if self.route != '/health':
+            raise ApiError(404, "Route tidak ditemukan")
+        model = load_model(self.model_file)
+        self._send(200, {
+            'status': 'ok',
+            'schema_version': model.schema_version,
+            'features': model.features,
+            'labels': {str(k): v for k, v in model.labels.items()},
+            'cache': cache_info(),
+        })
+
+    # path tanpa query string, dipakai untuk routing dan label metrik
+    @property
+    def route(self):
+        path = urlsplit(self.path).path
+        return path if path in ROUTES else 'other'
+
+    def do_POST(self):
+        with metrics.timer(f'api {self.route}'):
+            self._respond(self._handle_post)
+
+    def _handle_post(self):
+        body = self._read_json()
+        if self.route == '/score':
+            if not isinstance(body, dict):
+                raise ApiError(400, "Body harus berupa objek JSON satu record")
+            results, unknown = _score_records([body], self.model_file)
+            if results[0]['cluster'] is None:
+                raise ApiError(422, "Data tidak lengkap atau kategori tidak dikenali", unknown=unknown)
+            self._send(200, results[0])
+        elif self.route == '/score/batch':
+            records = body.get('records') if isinstance(body, dict) else None
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ApiError(400, "Body harus berupa {\"records\": [objek, ...]}")
+            if len(records) > MAX_BATCH_RECORDS:
+                raise ApiError(413, f"Maksimal {MAX_BATCH_RECORDS} record per request")
+            results, unknown = _score_records(records, self.model_file)
+            self._send(200, {'results': results, 'unknown': unknown})
+        else:
+            raise ApiError(404, "Route tidak ditemukan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API skoring malnutrisi lansia")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--model', default=ScoringHandler.model_file)
+    parser.add_argument('--verbose', action='store_true', help="tampilkan log setiap request")
+    parser.add_argument('--log-metrics', action='store_true', help="log JSON durasi setiap tahap ke stderr")
+    args = parser.parse_args()
+
+    if args.log_metrics:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        metrics.logger.addHandler(handler)
+        metrics.logger.setLevel(logging.INFO)
+
+    ScoringHandler.model_file = args.model
+    ScoringHandler.quiet = not args.verbose
+    load_model(args.model)  # muat model sekali sebelum menerima request
+
+    server = ThreadingHTTPServer((args.host, args.port), ScoringHandler)
+    print(f"API skoring berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,74 +1,38 @@
-import joblib
-import pandas as pd
-from scipy.spatial.distance import cdist
+import time
+
 import streamlit as st
-from pyclustering.cluster.cure import cure
-import numpy as np
-from streamlit_option_menu import option_menu
-
-def preprocess_data(data):
-    data = data.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-    data['Jenis_Kelamin'] = data['Jenis_Kelamin'].map({'Perempuan': 1, 'Laki-laki': 0})
-    data['Penyakit_Kronis'] = data['Penyakit_Kronis'].map({
-        'Ya': 1, 'Tidak': 0,
-    })
-    data['Stres'] = data['Stres'].map({'Ya': 1, 'Tidak': 0})
-    data['Frekuensi_Makan'] = data['Frekuensi_Makan'].map({
-        'Tiga kali atau lebih': 3,
-        'Dua kali': 2,
-        'Satu kali atau kurang': 1
-    })
-    data['Variasi_Makanan'] = data['Variasi_Makanan'].map({
-        'Makanan bervariasi (misalnya daging, sayuran, buah)': 3,
-        'Makanan terbatas pada beberapa jenis saja': 2,
-        'Makanan sangat terbatas atau monoton': 1
-    })
-    data['Asupan_Protein'] = data['Asupan_Protein'].map({
-        'Dua kali sehari atau lebih': 3,
-        'Sekali sehari': 2,
-        'Kurang dari sekali sehari atau tidak pernah': 1
-    })
-    data['Mobilitas'] = data['Mobilitas'].map({
-        'Bergerak dengan bebas tanpa bantuan': 3,
-        'Bergerak dengan bantuan': 2,
-        'Tidak dapat bergerak tanpa bantuan orang lain': 1
-    })
-    data['Aktivitas_Sehari_hari'] = data['Aktivitas_Sehari_hari'].map({
-        'Tidak ada kesulitan': 3,
-        'Kesulitan ringan': 2,
-        'Kesulitan berat': 1
-    })
-    data['Kesehatan_Mulut'] = data['Kesehatan_Mulut'].map({
-        'Tidak ada masalah': 3,
-        'Ada kesulitan ringan': 2,
-        'Kesulitan berat': 1,
-    })
-    data['Masalah_Kognitif'] = data['Masalah_Kognitif'].map({
-        'Tidak ada masalah daya ingat': 3,
-        'Ada sedikit masalah daya ingat': 2,
-        'Masalah daya ingat yang signifikan': 1
-    })
-
-    return data.drop(columns=['Nama'])
-
-def load_model(filename='cure_model.pkl'):
-    return joblib.load(filename)
-
-def load_scaler(filename='scaler.pkl'):
-    return joblib.load(filename)
 
+import metrics
+
+waktu_mulai = time.perf_counter()
+
+PAGES = ["Beranda", "Deteksi Malnutrisi", "Informasi", "Visualisasi"]
+IKON = {
+    "Beranda": ":material/home:",
+    "Deteksi Malnutrisi": ":material/monitor_heart:",
+    "Informasi": ":material/info:",
+    "Visualisasi": ":material/bar_chart:",
+}
 
 #Website
 st.set_page_config(page_title="Elderly Nutriion Care", layout="wide")
 
-selected = option_menu(
-        menu_title=None, 
-        options=["Beranda", "Deteksi Malnutrisi", "Informasi", "Visualisasi"],
-        icons=["house", "activity", "info", "bar-chart"],
-        menu_icon="cast",
-        default_index=0,
-        orientation="horizontal"
-)
+# halaman awal bisa dipilih lewat URL, misalnya ?page=Informasi
+halaman_awal = st.query_params.get("page", PAGES[0])
+if halaman_awal not in PAGES:
+    halaman_awal = PAGES[0]
+
+# menu bawaan Streamlit: komponen custom (streamlit-option-menu) ikut mengimpor
+# pyarrow/pandas di setiap rerun, termasuk halaman yang tidak butuh model
+selected = st.segmented_control(
+    "Menu",
+    PAGES,
+    format_func=lambda halaman: f"{IKON[halaman]} {halaman}",
+    default=halaman_awal,
+    key="menu",
+    label_visibility="collapsed"
+) or halaman_awal
+st.query_params["page"] = selected
 
 if selected == "Beranda":
     st.markdown(
@@ -87,6 +51,11 @@ if selected == "Beranda":
 
 
 elif selected == "Deteksi Malnutrisi":
+    import pandas as pd
+    from artifacts import cache_info
+    from detection import detect_new_data, intervensi, load_model, read_upload, score_batch
+    from preprocessing import INPUT_COLUMNS, preprocess_data
+
     st.title("Deteksi Malnutrisi pada Lansia")
     
     nama = st.text_input("Nama")
@@ -104,6 +73,7 @@ elif selected == "Deteksi Malnutrisi":
     stres = st.selectbox("Stres", ["--", "Ya", "Tidak"])
     penyakit_kronis = st.selectbox("Penyakit Kronis:", ["--", 'Ya', 'Tidak'])
     masalah_kognitif = st.selectbox("Masalah Kognitif", ["--", 'Tidak ada masalah daya ingat', 'Ada sedikit masalah daya ingat', 'Masalah daya ingat yang signifikan'])
+    simpan_data = st.checkbox("Simpan data (tanpa nama) untuk pembaruan model", value=False)
 
     if st.button("Deteksi Kluster"):
         if not nama:
@@ -152,61 +122,68 @@ elif selected == "Deteksi Malnutrisi":
                 'Mobilitas': [mobilitas],
                 'Aktivitas_Sehari_hari': [aktivitas_sehari_hari],
                 'Kesehatan_Mulut': [kesehatan_mulut],
-                'Penyakit_Kronis': ['Tidak'],
+                'Penyakit_Kronis': [penyakit_kronis],
                 'Stres': [stres],
                 'Masalah_Kognitif': [masalah_kognitif]
             })
 
-        scaler = load_scaler()
-        rep_points = load_model()
-
-        data_baru_preprocessed = preprocess_data(data_baru)
-
-        data_baru_scaled = scaler.transform(data_baru_preprocessed)
-
-        def detect_new_data(new_data_scaled, rep_points):
-            distances = []
-            for reps in rep_points:
-                dist = np.linalg.norm(new_data_scaled - reps, axis=1)
-                distances.append(np.min(dist))
-            return np.argmin(distances) + 1
-
-        cluster_detected = detect_new_data(data_baru_scaled, rep_points)
-
-        # st.write(f"Data baru masuk ke dalam klaster: {cluster_detected}")
-        
-        def intervensi(cluster):
-            if cluster == 2:
-                return (
-                    "### Klaster Malnutrisi Berat:\n"
-                    "**Intervensi:**\n"
-                    "- Pendekatan medis yang intensif, termasuk evaluasi komprehensif oleh dokter, ahli gizi, dan tim medis terkait.\n"
-                    "- Pemberian nutrisi melalui metode enteral atau parenteral sesuai kebutuhan, untuk memastikan asupan nutrisi yang tepat bagi pasien.\n"
-                    "- Terapi fisik dan intervensi mobilitas yang bertahap guna membantu meningkatkan kekuatan fisik.\n"
-                    "- Konseling psikologis untuk mengelola stres, depresi, atau kecemasan yang dapat memperburuk kondisi malnutrisi.\n"
-                )
-            elif cluster == 3:
-                return (
-                    "### Klaster Malnutrisi Ringan:\n"
-                    "**Intervensi:**\n"
-                    "- Pengaturan pola makan yang lebih seimbang dan bervariasi untuk mencegah malnutrisi lebih lanjut.\n"
-                    "- Kegiatan fisik ringan yang teratur untuk menjaga kesehatan fisik dan mobilitas.\n"
-                    "- Konseling psikologis ringan, jika diperlukan, untuk membantu manajemen stres.\n"
-                    "- Pengawasan berkala terhadap status gizi untuk memastikan stabilitas kondisi.\n"
-                )
-            elif cluster == 1:
-                return (
-                    "### Klaster Cukup Gizi:\n"
-                    "**Intervensi:**\n"
-                    "- Pemeliharaan gizi dengan pola makan yang seimbang dan aktivitas fisik teratur.\n"
-                    "- Konsultasi berkala dengan ahli gizi untuk memastikan asupan nutrisi tetap optimal.\n"
-                    "- Pemantauan kondisi kesehatan secara teratur untuk mendeteksi perubahan status gizi atau kondisi fisik.\n"
+            model = load_model()
+
+            with metrics.timer("preprocess"):
+                data_baru_preprocessed = preprocess_data(data_baru)
+
+            with metrics.timer("scale"):
+                data_baru_scaled = model.transform(data_baru_preprocessed)
+
+            cluster_detected = detect_new_data(data_baru_scaled, model)
+            st.session_state["lansia_terakhir"] = {
+                "Nama": nama,
+                "scaled": data_baru_scaled[0].tolist(),
+                "Klaster": int(cluster_detected),
+            }
+
+            # st.write(f"Data baru masuk ke dalam klaster: {cluster_detected}")
+
+            st.write(intervensi(model.labels.get(cluster_detected)))
+            st.caption("Posisi data ini terhadap data lain dapat dilihat di halaman Visualisasi.")
+
+            # diproses berkala oleh `python incremental.py update`
+            if simpan_data:
+                from incremental import append_pending
+                append_pending(data_baru)
+
+    st.divider()
+    st.subheader("Deteksi Banyak Data")
+    st.write("Unggah file CSV/Excel dengan kolom yang sama seperti data.csv.")
+
+    uploaded_file = st.file_uploader("File Skrining", type=["csv", "xlsx"])
+    if uploaded_file is not None:
+        try:
+            data_upload = read_upload(uploaded_file)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            kolom_kurang = [kolom for kolom in INPUT_COLUMNS if kolom not in data_upload.columns]
+            if kolom_kurang:
+                st.error("Kolom tidak ditemukan: " + ", ".join(kolom_kurang))
+            elif st.button("Deteksi Kluster File"):
+                hasil, unknown = score_batch(data_upload[INPUT_COLUMNS], load_model())
+                for kolom, nilai in unknown.items():
+                    st.warning(f"Kategori tidak dikenal di kolom {kolom}: {', '.join(map(str, nilai))}")
+
+                st.write(f"{len(hasil)} baris diproses, {hasil['Klaster'].isna().sum()} baris tidak dapat diklasifikasi.")
+                st.dataframe(hasil[['Nama', 'Klaster', 'Status']])
+                st.download_button(
+                    "Unduh Hasil (CSV)",
+                    data=hasil.to_csv(index=False).encode("utf-8"),
+                    file_name="hasil_deteksi.csv",
+                    mime="text/csv"
                 )
-            else:
-                return "Klaster tidak diketahui."
 
-        st.write(intervensi(cluster_detected))
-        
+    with st.expander("Info Cache Model"):
+        st.caption("Waktu muat (detik) dan jumlah cache hit untuk bundle model di proses ini.")
+        st.json(cache_info())
+
 elif selected == "Informasi":
     st.markdown(
         """
@@ -263,23 +240,69 @@ elif selected == "Informasi":
         """, unsafe_allow_html=True)
     
 elif selected == "Visualisasi":
-    st.markdown(
-        """
-        ### Visualisasi Hasil Clustering
-        Gambar di bawah menunjukkan visualisasi hasil clustering dengan PCA dari hasil penerapan model CURE untuk mengelompokkan status malnutrisi pada lansia dengan data sebanyak 517 baris.. 
-        Titik-titik pada visualisasi menggambarkan satu titik data. 
-        Pada gambar terdapat 3 kelompok data, masing-masing kelompok ditandai dengan warna titik yang berbeda:
-        - **Titik Ungu**: Nutrisi Baik
-        - **Titik Hijau**: Malnutrisi Berat
-        - **Titik Kuning**: Malnutrisi Ringan
-        """
-    )
-    
-    col1, col2, col3 = st.columns([1, 3, 1])  
-    
-    with col2:
-        st.image("visualisasi.png", caption="Hasil Clustering", use_column_width=True)
-    
+    import altair as alt
+    import pandas as pd
+    from artifacts import load_cached
+    from detection import load_model
+    from projection import DEFAULT_PROJECTION, load_projection, model_fingerprint
+
+    st.markdown("### Visualisasi Hasil Clustering")
+
+    model = load_model()
+    try:
+        projection = load_cached(DEFAULT_PROJECTION, load_projection, model=False)
+    except FileNotFoundError:
+        projection = None
+
+    if projection is None:
+        st.warning("Proyeksi belum dibuat. Jalankan `python projection.py` setelah training model.")
+    else:
+        if projection.fingerprint != model_fingerprint(model):
+            st.warning("Proyeksi dibuat dari model sebelumnya. Jalankan `python projection.py` untuk memperbaruinya.")
+
+        nama_klaster = {c: model.labels.get(c, f"Klaster {c}") for c in sorted(projection.counts)}
+        titik = pd.DataFrame({
+            "PC1": projection.points[:, 0],
+            "PC2": projection.points[:, 1],
+            "Status": pd.Series(projection.clusters).map(nama_klaster),
+        })
+        warna = alt.Scale(domain=list(nama_klaster.values()), scheme="viridis")
+        grafik = alt.Chart(titik).mark_circle(size=40, opacity=0.6).encode(
+            x=alt.X("PC1", title="Komponen Utama 1"),
+            y=alt.Y("PC2", title="Komponen Utama 2"),
+            color=alt.Color("Status", scale=warna, title="Klaster"),
+            tooltip=["Status"],
+        )
+
+        # posisi lansia yang terakhir dideteksi di sesi ini (halaman Deteksi Malnutrisi)
+        terakhir = st.session_state.get("lansia_terakhir")
+        if terakhir is not None:
+            posisi = projection.transform(terakhir["scaled"])[0]
+            lansia = pd.DataFrame({
+                "PC1": [posisi[0]],
+                "PC2": [posisi[1]],
+                "Nama": [terakhir["Nama"]],
+                "Status": [model.labels.get(terakhir["Klaster"], f"Klaster {terakhir['Klaster']}")],
+            })
+            grafik += alt.Chart(lansia).mark_point(shape="cross", size=400, filled=True, color="red").encode(
+                x="PC1", y="PC2", tooltip=["Nama", "Status"]
+            )
+
+        st.altair_chart(grafik.interactive(), width="stretch")
+
+        ditampilkan = len(projection.points)
+        st.caption(
+            f"Hasil clustering model CURE pada {projection.total} baris data, diproyeksikan dengan PCA "
+            f"(dua komponen menjelaskan {projection.explained.sum():.0%} varians). "
+            + (f"Ditampilkan sampel {ditampilkan} titik. " if ditampilkan < projection.total else "")
+            + "Setiap titik menggambarkan satu lansia; warna menunjukkan klaster."
+            + (f" Tanda silang merah: {terakhir['Nama']}." if terakhir is not None else "")
+        )
+        st.table(pd.DataFrame({
+            "Klaster": list(nama_klaster.values()),
+            "Jumlah Data": [projection.counts[c] for c in nama_klaster],
+        }))
+
     
 footer = """
 <style>
@@ -299,4 +322,24 @@ footer = """
     © 2024 Deteksi Malnutrisi pada Lansia
 </footer>
 """
+
+# panel debug, buka dengan ?debug=1 di URL
+if st.query_params.get("debug") == "1":
+    with st.expander("Debug: Latensi Pipeline", expanded=True):
+        snapshot = metrics.snapshot()
+        st.caption(f"Persentil dari {metrics.WINDOW} durasi terakhir per tahap di proses ini.")
+        st.table([
+            {
+                "Tahap": tahap,
+                "Jumlah": entry["count"],
+                "p50 (ms)": round(entry["p50"] * 1000, 2),
+                "p90 (ms)": round(entry["p90"] * 1000, 2),
+                "p99 (ms)": round(entry["p99"] * 1000, 2),
+            }
+            for tahap, entry in sorted(snapshot["stages"].items())
+        ])
+        st.json({"counter": snapshot["counters"], "info": snapshot["info"]})
+        st.code(metrics.prometheus_text(), language="text")
+
 st.markdown(footer, unsafe_allow_html=True)
+metrics.observe("rerun", time.perf_counter() - waktu_mulai)
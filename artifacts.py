@@ -0,0 +1,93 @@
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+import metrics
+
+# Cache artefak model per proses. Modul ini hanya diimpor sekali per proses,
+# sehingga isinya dipakai bersama oleh semua sesi dan rerun Streamlit.
+_lock = threading.Lock()
+_cache = {}
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Ganti file artefak dengan file sementara yang sudah lengkap (os.replace,
+# atomik). Di Windows ini gagal selama file tujuan masih dipetakan (mmap) oleh
+# proses lain, misalnya scaled_data.npy di kernel notebook.
+def replace_file(tmp_name, filename):
+    try:
+        os.replace(tmp_name, filename)
+    except OSError as e:
+        if getattr(e, 'winerror', None) not in (5, 32, 1224):
+            raise
+        raise PermissionError(
+            f"{filename} tidak dapat ditimpa karena masih dibuka atau dipetakan (mmap) proses lain; "
+            f"tutup proses tersebut (atau restart kernel notebook) lalu ulangi"
+        ) from e
+
+
+def _name(path, loader):
+    if loader is joblib.load:
+        return os.path.basename(path)
+    return f"{os.path.basename(path)} ({loader.__name__})"
+
+
+# Muat file dengan `loader` sekali saja; dimuat ulang hanya jika mtime/ukuran
+# file berubah (misalnya model baru di-deploy) tanpa perlu restart aplikasi.
+# Metrik model (load_model, model_loads, info "model") hanya dicatat jika
+# model=True, bukan untuk artefak lain seperti proyeksi halaman Visualisasi.
+def load_cached(filename, loader=joblib.load, model=True):
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        entry = _cache.get((path, loader))
+        if entry is not None and entry['key'] == key:
+            entry['hits'] += 1
+            if model:
+                metrics.count('model_cache_hits')
+            return entry['value']
+
+        start = time.perf_counter()
+        value = loader(path)
+        load_seconds = time.perf_counter() - start
+
+        _cache[(path, loader)] = {
+            'key': key,
+            'value': value,
+            'sha256': _sha256(path),
+            'load_seconds': load_seconds,
+            'loaded_at': time.time(),
+            'loads': (entry['loads'] if entry else 0) + 1,
+            'hits': entry['hits'] if entry else 0,
+        }
+        if model:
+            metrics.observe('load_model', load_seconds)
+            metrics.count('model_loads')
+            metrics.set_info('model', file=os.path.basename(path), sha256=_cache[(path, loader)]['sha256'],
+                             schema_version=getattr(value, 'schema_version', ''))
+        return value
+
+
+def cache_info():
+    with _lock:
+        return {
+            _name(path, loader): {k: v for k, v in entry.items() if k not in ('key', 'value')}
+            for (path, loader), entry in _cache.items()
+        }
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
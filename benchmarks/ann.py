@@ -0,0 +1,68 @@
+# Perbandingan runCURE eksak dengan mode useIndex (cureindex.py, KD-tree atas
+# titik rep klaster yang masih aktif) pada data.csv dan data sintetis.
+# Dicatat waktu training, apakah label identik, dan adjusted Rand index.
+#
+#   python benchmarks/ann.py [--sizes 1000,3000,10000] [--json hasil.json]
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bundle import load_bundle  # noqa: E402
+from cure import runCURE  # noqa: E402
+from pipeline import ALPHA, NUM_CLUSTERS, NUM_REP_POINTS, synthetic_data  # noqa: E402
+from preprocessing import preprocess_data  # noqa: E402
+from streaming import load_scaled  # noqa: E402
+
+
+def train(data, use_index):
+    t0 = time.perf_counter()
+    _, labels = runCURE(data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, useIndex=use_index)
+    return labels, time.perf_counter() - t0
+
+
+def compare(name, data):
+    exact, exact_seconds = train(data, False)
+    indexed, index_seconds = train(data, True)
+    return {
+        'data': name, 'rows': len(data), 'exact_seconds': exact_seconds, 'index_seconds': index_seconds,
+        'speedup': exact_seconds / index_seconds, 'identical': bool(np.array_equal(exact, indexed)),
+        'ari': adjusted_rand_score(exact, indexed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="runCURE eksak vs useIndex")
+    parser.add_argument('--sizes', default='1000,3000,10000', help="jumlah baris data sintetis, dipisah koma")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    model = load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+    base = pd.read_csv(os.path.join(ROOT, 'data.csv'))
+
+    results = [compare('data.csv', load_scaled(os.path.join(ROOT, 'scaled_data.npy')))]
+    for n in [int(size) for size in args.sizes.split(',')]:
+        data = model.transform(preprocess_data(synthetic_data(base, n, args.seed)))
+        results.append(compare('sintetis', data))
+
+    print(f"{'data':<9} {'baris':>7} {'eksak (s)':>10} {'indeks (s)':>11} {'speedup':>8} {'identik':>8} {'ARI':>6}")
+    for r in results:
+        print(f"{r['data']:<9} {r['rows']:>7} {r['exact_seconds']:>10.2f} {r['index_seconds']:>11.2f} "
+              f"{r['speedup']:>8.2f} {str(r['identical']):>8} {r['ari']:>6.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
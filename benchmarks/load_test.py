@@ -0,0 +1,114 @@
+# Load test untuk api.py: kirim request ke instance lokal secara paralel dan
+# laporkan latensi p50/p99 serta request per detik.
+#
+#   python api.py &
+#   python benchmarks/load_test.py [--url http://127.0.0.1:8000] [--concurrency 8]
+#                                  [--requests 2000] [--batch-size 0] [--json hasil.json]
+#
+# --batch-size 0 memakai route /score (satu record per request), selain itu
+# /score/batch dengan sejumlah record per request.
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# record contoh diambil dari data.csv (kolom mentah, belum di-encode)
+def read_records(filename):
+    import pandas as pd
+
+    data = pd.read_csv(filename)
+    return json.loads(data.to_json(orient="records", force_ascii=False))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def worker(url, bodies, path, latencies, errors):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test API skoring")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--data", default=os.path.join(ROOT, "data.csv"))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    records = read_records(args.data)
+    rng = random.Random(args.seed)
+    if args.batch_size:
+        path = "/score/batch"
+        bodies = [json.dumps({"records": rng.choices(records, k=args.batch_size)}) for _ in range(args.requests)]
+    else:
+        path = "/score"
+        bodies = [json.dumps(rng.choice(records)) for _ in range(args.requests)]
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=worker, args=(args.url, bodies[i::args.concurrency], path, latencies, errors))
+        for i in range(args.concurrency)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    hasil = {
+        "route": path,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "records_per_second": len(latencies) * max(1, args.batch_size) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else None,
+    }
+    print(f"{path}  concurrency={args.concurrency}  requests={hasil['requests']}  errors={hasil['errors']}")
+    if latencies:
+        print(f"  p50 {hasil['p50_ms']:.2f} ms   p99 {hasil['p99_ms']:.2f} ms   "
+              f"{hasil['rps']:.1f} req/s   {hasil['records_per_second']:.1f} record/s")
+    if errors:
+        print(f"  contoh error: {errors[:5]}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(hasil, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
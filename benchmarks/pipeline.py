@@ -0,0 +1,200 @@
+# Benchmark pipeline deteksi dan training dengan data sintetis (skema data.csv).
+#
+# Untuk setiap ukuran data diukur waktu dan memori puncak (tracemalloc) tahap:
+#   preprocess  preprocessing.preprocess_data
+#   scale       scaler dari bundle model (ModelBundle.transform)
+#   assign      titik rep terdekat (ModelBundle.assign / detect_clusters)
+#   lookup      titik rep terdekat dengan lookup.LookupScorer (dari hasil preprocess)
+#   train       cure.runCURE sampai --train-max baris, di atasnya cure.runCURELarge
+# Hasil tiap tahap dibandingkan dengan implementasi awal (benchmarks/reference.py)
+# dan ditulis ke file JSON agar bisa dibandingkan sebelum/sesudah optimasi.
+#
+#   python benchmarks/pipeline.py [--sizes 1000,10000,100000,1000000] [--json hasil.json]
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import joblib  # noqa: E402
+
+import reference  # noqa: E402
+from bundle import load_bundle  # noqa: E402
+from cure import labelData, runCURE, runCURELarge  # noqa: E402
+from lookup import LookupScorer  # noqa: E402
+from preprocessing import CODEBOOK, FEATURES, preprocess_data  # noqa: E402
+from streaming import load_scaled  # noqa: E402
+
+NUM_REP_POINTS = 5
+ALPHA = 0.3
+NUM_CLUSTERS = 3
+
+
+# Baris data.csv diambil acak lalu diberi variasi: angka digeser sedikit dan
+# sebagian kategori diganti nilai lain dari codebook.
+def synthetic_data(base, n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    data['Nama'] = [f"Lansia {i}" for i in range(n)]
+    data['Umur'] = (data['Umur'] + rng.integers(-2, 3, n)).clip(lower=60)
+    data['Berat_Badan'] = data['Berat_Badan'] + rng.integers(-3, 4, n)
+    data['Tinggi_Badan'] = data['Tinggi_Badan'] + rng.integers(-2, 3, n)
+    data['Penurunan_Berat_Badan'] = (data['Penurunan_Berat_Badan'] + rng.integers(-1, 2, n)).clip(0, 5)
+    for kolom, table in CODEBOOK.items():
+        ganti = rng.random(n) < 0.1
+        data.loc[ganti, kolom] = rng.choice(list(table), ganti.sum())
+    return data
+
+
+def measure(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - t0)
+    return result, runs
+
+
+# memori puncak diukur di run terpisah karena tracemalloc memperlambat kode Python
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def check(stage, rows, new, ref):
+    new, ref = np.asarray(new, dtype=np.float64), np.asarray(ref, dtype=np.float64)
+    identical = new.shape == ref.shape and np.array_equal(new, ref, equal_nan=True)
+    mismatches = int((new != ref).sum()) if new.shape == ref.shape else None
+    return {'stage': stage, 'rows': rows, 'compared': len(ref), 'identical': bool(identical), 'mismatches': mismatches}
+
+
+def bench_size(base, n, args, model, scaler, rep_points, lookup):
+    data = synthetic_data(base, n, args.seed)
+    results, checks = [], []
+
+    def record(stage, fn, repeat, **extra):
+        result, runs = measure(fn, repeat)
+        peak = peak_memory(fn) if args.memory else None
+        results.append({
+            'rows': n, 'stage': stage, 'seconds': min(runs), 'runs': runs,
+            'rows_per_second': n / min(runs) if min(runs) > 0 else None,
+            'peak_mb': peak / 2**20 if peak is not None else None, **extra,
+        })
+        return result
+
+    encoded = record('preprocess', lambda: preprocess_data(data), args.repeat)
+    scaled = record('scale', lambda: model.transform(encoded), args.repeat)
+    labels = record('assign', lambda: model.assign(scaled), args.repeat)
+    lookup_labels = record('lookup', lambda: lookup.assign(encoded), args.repeat)
+
+    # pembanding: implementasi awal pada sebagian baris
+    sample = data.iloc[:args.check_rows]
+    encoded_ref = reference.preprocess_data(sample.copy())[FEATURES]
+    scaled_ref = scaler.transform(encoded_ref)
+    checks.append(check('preprocess', n, encoded.iloc[:args.check_rows], encoded_ref))
+    checks.append(check('scale', n, scaled[:args.check_rows], scaled_ref))
+    checks.append(check('assign', n, labels[:args.check_rows],
+                        [reference.detect_new_data(row, rep_points) for row in scaled_ref]))
+    checks.append(check('lookup', n, lookup_labels, labels))
+
+    if n <= args.train_max:
+        _, train_labels = record('train', lambda: runCURE(scaled, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS), 1,
+                                 method='runCURE')
+        if n <= args.reference_train_rows:
+            _, ref_labels = reference.runCURE(scaled, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+            checks.append(check('train', n, train_labels, ref_labels))
+    elif not args.skip_large:
+        def train_large():
+            clusters = runCURELarge(scaled, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, sampleSize=args.sample_size,
+                                    seed=args.seed)
+            return labelData(scaled, [cluster.repPoints for cluster in clusters])
+        record('train', train_large, 1, method='runCURELarge', sample_size=args.sample_size)
+
+    return results, checks
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing, scaler, assignment dan training CURE")
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000', help="jumlah baris, dipisah koma")
+    parser.add_argument('--repeat', type=int, default=3, help="pengulangan tahap selain training (diambil yang tercepat)")
+    parser.add_argument('--train-max', type=int, default=10000, help="batas baris untuk runCURE penuh")
+    parser.add_argument('--sample-size', type=int, default=5000, help="sampleSize runCURELarge di atas --train-max")
+    parser.add_argument('--skip-large', action='store_true', help="lewati training di atas --train-max")
+    parser.add_argument('--check-rows', type=int, default=5000, help="baris yang dibandingkan dengan implementasi awal")
+    parser.add_argument('--reference-train-rows', type=int, default=0,
+                        help="bandingkan label training sintetis dengan runCURE awal sampai ukuran ini (lambat, O(n^3))")
+    parser.add_argument('--no-reference-train', action='store_true', help="lewati pembandingan training pada data.csv")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="tanpa pengukuran memori puncak")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    base = pd.read_csv(os.path.join(ROOT, 'data.csv'))
+    model = load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+    scaler = joblib.load(os.path.join(ROOT, 'scaler.pkl'))
+    rep_points = joblib.load(os.path.join(ROOT, 'cure_model.pkl'))
+    lookup = LookupScorer(model)
+
+    results, checks = [], []
+    print(f"{'baris':>9} {'tahap':<11} {'detik':>9} {'baris/detik':>13} {'memori MB':>10}")
+    for n in [int(size) for size in args.sizes.split(',')]:
+        size_results, size_checks = bench_size(base, n, args, model, scaler, rep_points, lookup)
+        for r in size_results:
+            peak = f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else '-'
+            print(f"{n:>9} {r['stage']:<11} {r['seconds']:>9.4f} {r['rows_per_second']:>13.0f} {peak:>10}")
+        results += size_results
+        checks += size_checks
+
+    # label training pada data asli harus sama persis dengan notebook awal
+    if not args.no_reference_train:
+        scaled_data = load_scaled(os.path.join(ROOT, 'scaled_data.npy'))
+        _, labels = runCURE(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+        _, ref_labels = reference.runCURE(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+        checks.append(check('train (data.csv)', len(scaled_data), labels, ref_labels))
+
+    print()
+    for c in checks:
+        status = 'sama' if c['identical'] else f"BERBEDA ({c['mismatches']} nilai)"
+        print(f"cek {c['stage']:<17} {c['rows']:>9} baris ({c['compared']} dibandingkan): {status}")
+
+    if args.json:
+        meta = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        }
+        with open(args.json, 'w') as f:
+            json.dump({'meta': meta, 'results': results, 'checks': checks}, f, indent=2)
+
+    if not all(c['identical'] for c in checks):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+# Implementasi awal (notebook cure.ipynb dan app.py versi pertama), disimpan
+# apa adanya sebagai acuan label untuk benchmarks/pipeline.py. Hanya baris print
+# yang dihapus; jangan dioptimasi.
+import numpy as np
+import scipy.spatial.distance as distance
+
+
+def preprocess_data(data):
+    # DataFrame.applymap berganti nama menjadi DataFrame.map di pandas >= 2.1
+    applymap = data.map if hasattr(data, 'map') else data.applymap
+    data = applymap(lambda x: x.strip() if isinstance(x, str) else x)
+    data['Jenis_Kelamin'] = data['Jenis_Kelamin'].map({'Perempuan': 1, 'Laki-laki': 0})
+    data['Penyakit_Kronis'] = data['Penyakit_Kronis'].map({
+        'Ya': 1, 'Tidak': 0,
+    })
+    data['Stres'] = data['Stres'].map({'Ya': 1, 'Tidak': 0})
+    data['Frekuensi_Makan'] = data['Frekuensi_Makan'].map({
+        'Tiga kali atau lebih': 3,
+        'Dua kali': 2,
+        'Satu kali atau kurang': 1
+    })
+    data['Variasi_Makanan'] = data['Variasi_Makanan'].map({
+        'Makanan bervariasi (misalnya daging, sayuran, buah)': 3,
+        'Makanan terbatas pada beberapa jenis saja': 2,
+        'Makanan sangat terbatas atau monoton': 1
+    })
+    data['Asupan_Protein'] = data['Asupan_Protein'].map({
+        'Dua kali sehari atau lebih': 3,
+        'Sekali sehari': 2,
+        'Kurang dari sekali sehari atau tidak pernah': 1
+    })
+    data['Mobilitas'] = data['Mobilitas'].map({
+        'Bergerak dengan bebas tanpa bantuan': 3,
+        'Bergerak dengan bantuan': 2,
+        'Tidak dapat bergerak tanpa bantuan orang lain': 1
+    })
+    data['Aktivitas_Sehari_hari'] = data['Aktivitas_Sehari_hari'].map({
+        'Tidak ada kesulitan': 3,
+        'Kesulitan ringan': 2,
+        'Kesulitan berat': 1
+    })
+    data['Kesehatan_Mulut'] = data['Kesehatan_Mulut'].map({
+        'Tidak ada masalah': 3,
+        'Ada kesulitan ringan': 2,
+        'Kesulitan berat': 1,
+    })
+    data['Masalah_Kognitif'] = data['Masalah_Kognitif'].map({
+        'Tidak ada masalah daya ingat': 3,
+        'Ada sedikit masalah daya ingat': 2,
+        'Masalah daya ingat yang signifikan': 1
+    })
+
+    return data.drop(columns=['Nama'])
+
+
+def detect_new_data(new_data_scaled, rep_points):
+    distances = []
+    for reps in rep_points:
+        dist = np.linalg.norm(new_data_scaled - reps, axis=1)
+        distances.append(np.min(dist))
+    return np.argmin(distances) + 1
+
+
+# Distance function
+def dist(vecA, vecB):
+    return np.sqrt(np.power(vecA - vecB, 2).sum()) # jarak Euclidean
+
+# CURE Cluster class
+class CureCluster:
+    def __init__(self, id__, center__):
+        self.points = np.array(center__) # titik data
+        self.repPoints = np.array(center__) # titik rep
+        self.center = np.array(center__) # titik pusat
+        self.index = [id__] # index titik
+
+    def __repr__(self):
+        return "Cluster " + " Size: " + str(len(self.points))
+
+    def computeCentroid(self, clust):
+        totalPoints_1 = len(self.index)
+        totalPoints_2 = len(clust.index)
+        self.center = (self.center * totalPoints_1 + clust.center * totalPoints_2) / (totalPoints_1 + totalPoints_2)
+
+    def generateRepPoints(self, numRepPoints, alpha):
+        tempSet = None
+        for i in range(1, numRepPoints + 1):
+            maxDist = 0
+            maxPoint = None
+            for p in range(len(self.index)):
+                if i == 1:
+                    minDist = dist(self.points[p, :], self.center) # rep 1 menghitung titik data dengan titik pusat
+                else:
+                    X = np.vstack([tempSet, self.points[p, :]]) # rep 2 dst. hitung jarak tempset dan titik data
+                    tmpDist = distance.pdist(X)
+                    minDist = tmpDist.min()
+                if minDist >= maxDist: # mencari titik terjauh dari semua jarak antar titik s/d seluruh jumlah titik
+                    maxDist = minDist
+                    maxPoint = self.points[p, :]
+            if tempSet is None:
+                tempSet = maxPoint
+            else:
+                tempSet = np.vstack((tempSet, maxPoint))
+        for j in range(len(tempSet)):
+            if self.repPoints is None:
+                self.repPoints = tempSet[j, :] + alpha * (self.center - tempSet[j, :]) # modifikasi posisi titik sesuai alpha
+            else:
+                self.repPoints = np.vstack((self.repPoints, tempSet[j, :] + alpha * (self.center - tempSet[j, :])))
+
+    def distRep(self, clust):
+        distRep = float('inf')
+        for repA in self.repPoints:
+            if type(clust.repPoints[0]) != list:
+                repB = clust.repPoints
+                distTemp = dist(repA, repB)
+                if distTemp < distRep:
+                    distRep = distTemp
+            else:
+                for repB in clust.repPoints:
+                    distTemp = dist(repA, repB)
+                    if distTemp < distRep:
+                        distRep = distTemp
+        return distRep
+
+    def mergeWithCluster(self, clust, numRepPoints, alpha):
+        self.computeCentroid(clust)
+        self.points = np.vstack((self.points, clust.points))
+        self.index = np.append(self.index, clust.index)
+        self.repPoints = None
+        self.generateRepPoints(numRepPoints, alpha)
+
+# Function to run CURE
+def runCURE(data, numRepPoints, alpha, numDesCluster):
+    Clusters = []
+    numCluster = len(data)
+    numPts = len(data)
+    distCluster = np.ones([len(data), len(data)]) * float('inf')
+
+    for idPoint in range(len(data)):
+        newClust = CureCluster(idPoint, data[idPoint, :])
+        Clusters.append(newClust)
+
+    for row in range(numPts):
+        for col in range(row):
+            distCluster[row][col] = dist(Clusters[row].center, Clusters[col].center)
+
+    while numCluster > numDesCluster:
+        minIndex = np.where(distCluster == np.min(distCluster))
+        minIndex1, minIndex2 = minIndex[0][0], minIndex[1][0]
+
+        Clusters[minIndex1].mergeWithCluster(Clusters[minIndex2], numRepPoints, alpha)
+
+        for i in range(0, minIndex1):
+            distCluster[minIndex1, i] = Clusters[minIndex1].distRep(Clusters[i])
+        for i in range(minIndex1 + 1, numCluster):
+            distCluster[i, minIndex1] = Clusters[minIndex1].distRep(Clusters[i])
+
+        distCluster = np.delete(distCluster, minIndex2, axis=0)
+        distCluster = np.delete(distCluster, minIndex2, axis=1)
+        del Clusters[minIndex2]
+        numCluster -= 1
+
+    Label = [0] * numPts
+    for i in range(len(Clusters)):
+        for j in range(len(Clusters[i].index)):
+            Label[Clusters[i].index[j]] = i + 1
+
+    return Clusters, Label  # Return both Clusters and Label
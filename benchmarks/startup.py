@@ -0,0 +1,79 @@
+# Benchmark waktu render pertama tiap halaman app.py.
+#
+# Setiap halaman dijalankan di proses Python baru (cold start) dengan
+# streamlit.testing.AppTest, memakai ?page=<halaman> untuk memilih menu.
+#
+#   python benchmarks/startup.py [--repeat 3] [--json hasil.json]
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120)
+at.query_params["page"] = sys.argv[1]
+at.run()
+t2 = time.perf_counter()
+at.run()
+t3 = time.perf_counter()
+heavy = [m for m in ("pandas", "numpy", "scipy", "sklearn", "pyclustering") if m in sys.modules]
+print(json.dumps({
+    "import_streamlit": t1 - t0,
+    "first_render": t2 - t1,
+    "rerun": t3 - t2,
+    "exceptions": [str(e.message) for e in at.exception],
+    "heavy_modules": heavy,
+}))
+"""
+
+
+# daftar halaman dibaca dari app.py tanpa menjalankan script Streamlit-nya
+def read_pages():
+    with open(os.path.join(ROOT, "app.py")) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "PAGES" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("PAGES tidak ditemukan di app.py")
+
+
+def measure(page):
+    out = subprocess.run([sys.executable, "-c", CHILD, page], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu render pertama tiap halaman app.py")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    hasil = {}
+    print(f"{'halaman':<20} {'import st':>10} {'render 1':>10} {'rerun':>10}  modul berat")
+    for page in read_pages():
+        runs = [measure(page) for _ in range(args.repeat)]
+        ringkas = {key: statistics.median(run[key] for run in runs) for key in ("import_streamlit", "first_render", "rerun")}
+        ringkas["heavy_modules"] = runs[-1]["heavy_modules"]
+        ringkas["exceptions"] = runs[-1]["exceptions"]
+        hasil[page] = ringkas
+        print(f"{page:<20} {ringkas['import_streamlit']:>10.3f} {ringkas['first_render']:>10.3f} "
+              f"{ringkas['rerun']:>10.3f}  {', '.join(ringkas['heavy_modules']) or '-'}")
+        for e in ringkas["exceptions"]:
+            print(f"  exception: {e}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(hasil, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import json
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+from artifacts import replace_file
+from preprocessing import FEATURES
+from scoring import RepIndex
+
+# Format bundle model (satu file):
+#   MAGIC (8 byte) | panjang header (uint32 little-endian) | header JSON (utf-8)
+#   | padding sampai kelipatan ALIGN | blok titik rep float32 (num_reps x num_features)
+# Header berisi versi skema, urutan fitur, mean/scale scaler, dan daftar klaster
+# (id, label, jumlah titik rep) sesuai urutan baris pada blok titik rep.
+MAGIC = b'MALNUTB\x00'
+SCHEMA_VERSION = 1
+ALIGN = 64
+DEFAULT_BUNDLE = 'cure_model.bundle'
+
+# Label klaster untuk model CURE yang sekarang di-deploy (cure_model.pkl); model
+# hasil training ulang harus diberi label sendiri, lihat match_cluster_labels
+CLUSTER_LABELS = {1: 'Cukup Gizi', 2: 'Malnutrisi Berat', 3: 'Malnutrisi Ringan'}
+
+
+class ModelBundle:
+    def __init__(self, header, reps, path=None, backend='auto'):
+        self.header = header
+        self.path = path
+        self.schema_version = header['schema_version']
+        self.features = header['features']
+        self.mean = np.array(header['scaler_mean'], dtype=np.float64)
+        self.scale = np.array(header['scaler_scale'], dtype=np.float64)
+        self.labels = {c['id']: c['label'] for c in header['clusters']}
+        self.reps = reps
+        self.cluster_ids = np.repeat([c['id'] for c in header['clusters']], [c['num_reps'] for c in header['clusters']])
+        self.index = RepIndex(self.reps, self.cluster_ids, backend=backend)
+
+    def __repr__(self):
+        return f"ModelBundle(v{self.schema_version}, {len(self.labels)} klaster, {len(self.reps)} titik rep)"
+
+    # sama dengan StandardScaler.transform
+    def transform(self, data):
+        if hasattr(data, 'columns') and list(data.columns) != self.features:
+            raise ValueError(f"Urutan kolom tidak sesuai dengan model: {list(data.columns)}")
+        data = np.asarray(data, dtype=np.float64)
+        return (data - self.mean) / self.scale
+
+    def assign(self, data_scaled):
+        return self.index.assign(data_scaled)
+
+    # titik rep per klaster (view ke blok, tanpa salinan)
+    @property
+    def rep_points(self):
+        bounds = np.cumsum([0] + [c['num_reps'] for c in self.header['clusters']])
+        return [self.reps[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def save_bundle(filename, rep_points, scaler_mean, scaler_scale, cluster_labels, features=FEATURES):
+    reps = np.ascontiguousarray(np.vstack(rep_points), dtype='<f4')
+    clusters = [
+        {'id': i, 'label': cluster_labels.get(i, f'Klaster {i}'), 'num_reps': len(points)}
+        for i, points in enumerate(rep_points, start=1)
+    ]
+    header = {
+        'schema_version': SCHEMA_VERSION,
+        'features': list(features),
+        'scaler_mean': [float(x) for x in scaler_mean],
+        'scaler_scale': [float(x) for x in scaler_scale],
+        'clusters': clusters,
+        'dtype': '<f4',
+        'shape': list(reps.shape),
+    }
+    if reps.shape[1] != len(header['features']) or len(header['scaler_mean']) != len(header['features']):
+        raise ValueError("Jumlah fitur titik rep/scaler tidak sama dengan jumlah fitur")
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    offset = len(MAGIC) + 4 + len(header_bytes)
+    padding = (-offset) % ALIGN
+
+    # tulis ke file sementara lalu replace_file, agar proses yang sedang
+    # memuat file lama tidak membaca file setengah jadi
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b'\x00' * padding)
+            f.write(reps.tobytes())
+        os.chmod(tmp_name, 0o644)
+        replace_file(tmp_name, filename)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+# Label klaster hasil training baru dari model yang sedang di-deploy: setiap klaster
+# baru mendapat label klaster lama yang paling banyak menampung titik-titiknya.
+# labels adalah nomor klaster baru (1..k) untuk setiap baris data_scaled.
+def match_cluster_labels(data_scaled, labels, model):
+    labels = np.asarray(labels)
+    assigned = model.assign(data_scaled)
+    cluster_labels = {}
+    for c in np.unique(labels):
+        ids, counts = np.unique(assigned[labels == c], return_counts=True)
+        cluster_labels[int(c)] = model.labels[int(ids[counts.argmax()])]
+    if len(set(cluster_labels.values())) < len(cluster_labels):
+        raise ValueError(f"Beberapa klaster baru cocok dengan label yang sama: {cluster_labels}")
+    return cluster_labels
+
+
+def read_header(filename):
+    with open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} bukan file bundle model")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"Versi skema bundle tidak didukung: {header.get('schema_version')}")
+    offset = len(MAGIC) + 4 + header_len
+    return header, offset + (-offset) % ALIGN
+
+
+# Blok titik rep dipetakan langsung dari file (np.memmap, read-only), sehingga
+# beberapa replika aplikasi di satu host berbagi page cache yang sama. Di Windows
+# file yang sedang dipetakan tidak bisa ditimpa, jadi di sana blok dibaca ke
+# memori agar save_bundle (incremental.py update) tetap bisa jalan saat aplikasi aktif.
+def load_bundle(filename=DEFAULT_BUNDLE, backend='auto'):
+    header, offset = read_header(filename)
+    shape = tuple(header['shape'])
+    if os.name == 'nt':
+        reps = np.fromfile(filename, dtype=header['dtype'], count=int(np.prod(shape)), offset=offset).reshape(shape)
+    else:
+        reps = np.memmap(filename, dtype=header['dtype'], mode='r', offset=offset, shape=shape)
+    return ModelBundle(header, reps, path=filename, backend=backend)
+
+
+# Konversi artefak lama (scaler.pkl + cure_model.pkl) ke bundle:
+#   python bundle.py [scaler.pkl] [cure_model.pkl] [cure_model.bundle]
+if __name__ == '__main__':
+    import joblib
+
+    defaults = ['scaler.pkl', 'cure_model.pkl', DEFAULT_BUNDLE]
+    scaler_file, model_file, bundle_file = sys.argv[1:4] + defaults[len(sys.argv[1:4]):]
+    scaler = joblib.load(scaler_file)
+    features = list(getattr(scaler, 'feature_names_in_', FEATURES))
+    save_bundle(bundle_file, joblib.load(model_file), scaler.mean_, scaler.scale_, CLUSTER_LABELS, features)
+    print(load_bundle(bundle_file))
@@ -0,0 +1,346 @@
+import heapq
+
+import joblib
+import numpy as np
+from scipy.spatial.distance import cdist
+
+# Batas memori (byte) untuk satu blok matriks jarak awal
+DIST_BLOCK_BYTES = 64 * 1024 * 1024
+# Batas memori default untuk runCURELarge dan labelData
+MEMORY_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+# CURE Cluster class
+class CureCluster:
+    def __init__(self, id__, center__):
+        self.points = np.atleast_2d(center__) # titik data
+        self.repPoints = np.atleast_2d(center__) # titik rep
+        self.center = np.array(center__) # titik pusat
+        self.index = [id__] # index titik
+
+    def __repr__(self):
+        return "Cluster " + " Size: " + str(len(self.points))
+
+    def computeCentroid(self, clust):
+        totalPoints_1 = len(self.index)
+        totalPoints_2 = len(clust.index)
+        self.center = (self.center * totalPoints_1 + clust.center * totalPoints_2) / (totalPoints_1 + totalPoints_2)
+
+    def generateRepPoints(self, numRepPoints, alpha):
+        # farthest-point sampling, minDist = jarak tiap titik ke rep terpilih terdekat
+        minDist = np.power(self.points - self.center, 2).sum(axis=1) # rep 1 menghitung titik data dengan titik pusat
+        chosen = []
+        for i in range(numRepPoints):
+            p = len(minDist) - 1 - np.argmax(minDist[::-1]) # titik terjauh, jika seri ambil yang terakhir
+            chosen.append(p)
+            distP = np.power(self.points - self.points[p], 2).sum(axis=1)
+            minDist = distP if i == 0 else np.minimum(minDist, distP)
+        tempSet = self.points[chosen]
+        self.repPoints = tempSet + alpha * (self.center - tempSet) # modifikasi posisi titik sesuai alpha
+        self.repCenter = self.center.copy() # pusat saat titik rep dibuat, untuk drift()
+
+    # jarak = min atas rep klaster ini dari akar jumlah kuadrat jarak ke semua rep `clust`
+    def distRep(self, clust):
+        return np.sqrt(cdist(self.repPoints, clust.repPoints, 'sqeuclidean').sum(axis=1).min())
+
+    def mergeWithCluster(self, clust, numRepPoints, alpha):
+        self.computeCentroid(clust)
+        self.points = np.vstack((self.points, clust.points))
+        self.index = np.append(self.index, clust.index)
+        self.repPoints = None
+        self.generateRepPoints(numRepPoints, alpha)
+
+    # pergeseran pusat sejak titik rep terakhir dibuat, relatif terhadap
+    # rata-rata jarak titik rep ke pusat tersebut
+    def drift(self):
+        repCenter = getattr(self, 'repCenter', self.center)
+        shift = np.linalg.norm(self.center - repCenter)
+        spread = np.linalg.norm(self.repPoints - repCenter, axis=1).mean()
+        if spread == 0:
+            return np.inf if shift > 0 else 0.0
+        return shift / spread
+
+    # Tambah titik baru (sudah di-scale) ke klaster tanpa training ulang. Pusat
+    # diperbarui dengan running mean computeCentroid; titik rep baru dihitung
+    # ulang hanya jika drift() melebihi driftThreshold. Return True jika dihitung ulang.
+    def addPoints(self, points, index, numRepPoints, alpha, driftThreshold=0.1):
+        points = np.atleast_2d(np.asarray(points, dtype=self.points.dtype))
+        batch = CureCluster(index[0], points.mean(axis=0))
+        batch.index = list(index)
+        self.computeCentroid(batch)
+        self.points = np.vstack((self.points, points))
+        self.index = np.append(self.index, index)
+        if self.drift() > driftThreshold:
+            self.generateRepPoints(numRepPoints, alpha)
+            return True
+        return False
+
+
+# Jarak CureCluster.distRep dari klaster `u` ke setiap klaster di `others`.
+# Pasangan dihitung dari sisi klaster yang terakhir di-merge (sama seperti
+# matriks jarak pada versi lama), titik rep klaster tunggal = titik datanya
+# yang disimpan di reps[:, 0].
+def _distToClusters(u, others, reps, lastMerge):
+    repsU = reps[u] if lastMerge[u] >= 0 else reps[u, :1]
+    result = np.empty(len(others))
+
+    single = lastMerge[others] < 0
+    if single.any():
+        sq = cdist(repsU, reps[others[single], 0], 'sqeuclidean')
+        result[single] = np.sqrt(sq.min(axis=0))
+
+    merged = ~single
+    if merged.any():
+        idx = others[merged]
+        numRep, numDim = reps.shape[1:]
+        sq = cdist(repsU, reps[idx].reshape(-1, numDim), 'sqeuclidean').reshape(len(repsU), len(idx), numRep)
+        selfIsU = (lastMerge[u] > lastMerge[idx]) | ((lastMerge[u] == lastMerge[idx]) & (u > idx))
+        out = np.where(selfIsU, sq.sum(axis=2).min(axis=0), sq.sum(axis=0).min(axis=1))
+        result[merged] = np.sqrt(out)
+
+    return result
+
+
+# Pencarian kandidat untuk _mergeClusters: jarak dihitung ke semua klaster aktif.
+# cureindex.IndexedSearch (runCURE(..., useIndex=True)) mempersempit kandidat
+# dengan KD-tree; hasilnya identik.
+class ExactSearch:
+    def __init__(self, reps, lastMerge, active, nnDist):
+        self.reps = reps
+        self.lastMerge = lastMerge
+        self.active = active
+        self.nnDist = nnDist
+
+    def others(self, u):
+        others = np.flatnonzero(self.active)
+        return others[others != u]
+
+    # (klaster, jarak ke u) yang pasti memuat tetangga terdekat u
+    def nearest(self, u):
+        others = self.others(u)
+        return others, _distToClusters(u, others, self.reps, self.lastMerge)
+
+    # klaster yang jaraknya ke u (baru saja di-merge) perlu dihitung ulang
+    def mergeCandidates(self, u):
+        return self.others(u)
+
+    # titik rep klaster u berubah
+    def update(self, u):
+        pass
+
+
+def _searchClass(useIndex):
+    if not useIndex:
+        return ExactSearch
+    from cureindex import IndexedSearch
+    return IndexedSearch
+
+
+# Kunci urutan merge: (jarak, index baris, index kolom) seperti np.where pada matriks segitiga bawah
+def _isBefore(distA, u, vA, distB, vB):
+    hiA, loA = np.maximum(u, vA), np.minimum(u, vA)
+    hiB, loB = np.maximum(u, vB), np.minimum(u, vB)
+    return (distA < distB) | ((distA == distB) & ((hiA < hiB) | ((hiA == hiB) & (loA <= loB))))
+
+
+# Gabungkan klaster-klaster awal (titik tunggal atau hasil partial clustering)
+# sampai tersisa numDesCluster. Urutan klaster hasil mengikuti urutan input.
+# Jika `history` berupa list, setiap merge dicatat sebagai (index penyerap, index terserap).
+# `search` menentukan klaster mana yang jaraknya dihitung (lihat ExactSearch).
+def _mergeClusters(Clusters, numRepPoints, alpha, numDesCluster, verbose=False, history=None, search=ExactSearch):
+    Clusters = list(Clusters)
+    numCluster = len(Clusters)
+    numDim = Clusters[0].center.shape[0]
+
+    active = np.ones(numCluster, dtype=bool)
+    lastMerge = np.array([-1 if len(clust.index) == 1 else 0 for clust in Clusters])
+    reps = np.empty((numCluster, numRepPoints, numDim), dtype=Clusters[0].points.dtype)
+    for u, clust in enumerate(Clusters):
+        reps[u] = clust.repPoints[np.arange(numRepPoints) % len(clust.repPoints)]
+
+    # cache tetangga terdekat tiap klaster (jika seri, index terkecil)
+    nn = np.empty(numCluster, dtype=np.intp)
+    nnDist = np.empty(numCluster)
+    if (lastMerge < 0).all():
+        points = reps[:, 0]
+        blockRows = max(1, DIST_BLOCK_BYTES // (8 * numCluster))
+        for start in range(0, numCluster, blockRows):
+            stop = min(start + blockRows, numCluster)
+            block = cdist(points[start:stop], points, 'sqeuclidean')
+            block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            nn[start:stop] = block.argmin(axis=1)
+            nnDist[start:stop] = np.sqrt(block[np.arange(stop - start), nn[start:stop]])
+    else:
+        for u in range(numCluster):
+            others = np.delete(np.arange(numCluster), u)
+            distU = _distToClusters(u, others, reps, lastMerge)
+            nn[u], nnDist[u] = others[distU.argmin()], distU.min()
+
+    version = np.zeros(numCluster, dtype=np.int64)
+    heap = [(nnDist[u], max(u, nn[u]), min(u, nn[u]), u, 0) for u in range(numCluster)]
+    heapq.heapify(heap)
+
+    def push(u):
+        version[u] += 1
+        heapq.heappush(heap, (nnDist[u], max(u, nn[u]), min(u, nn[u]), u, version[u]))
+
+    search = search(reps, lastMerge, active, nnDist)
+
+    def rescan(u):
+        others, distU = search.nearest(u)
+        best = distU.argmin()
+        nn[u], nnDist[u] = others[best], distU[best]
+        push(u)
+
+    step = lastMerge.max() + 1
+    while numCluster > numDesCluster:
+        if verbose and np.mod(numCluster, 50) == 0:
+            print('Cluster count:', numCluster)
+
+        _, minIndex1, minIndex2, u, ver = heapq.heappop(heap)
+        if not active[u] or ver != version[u]:
+            continue
+
+        # klaster dengan index lebih besar menyerap yang lebih kecil, tanpa menghapus matriks
+        Clusters[minIndex1].mergeWithCluster(Clusters[minIndex2], numRepPoints, alpha)
+        Clusters[minIndex2] = None
+        active[minIndex2] = False
+        if history is not None:
+            history.append((minIndex1, minIndex2))
+        reps[minIndex1] = Clusters[minIndex1].repPoints
+        lastMerge[minIndex1] = step
+        step += 1
+        numCluster -= 1
+        if numCluster == 1:
+            break
+        search.update(minIndex1)
+        # klaster yang tetangga terdekatnya ikut di-merge harus dicari ulang
+        stale = active & ((nn == minIndex1) | (nn == minIndex2))
+        stale[minIndex1] = False
+
+        others = search.mergeCandidates(minIndex1)
+        distNew = _distToClusters(minIndex1, others, reps, lastMerge)
+        best = distNew.argmin()
+        nn[minIndex1], nnDist[minIndex1] = others[best], distNew[best]
+        push(minIndex1)
+
+        better = _isBefore(distNew, others, minIndex1, nnDist[others], nn[others])
+        nn[others[better]] = minIndex1
+        nnDist[others[better]] = distNew[better]
+        stale[others[better]] = False
+        for v in others[better]:
+            push(v)
+        for v in np.flatnonzero(stale):
+            rescan(v)
+
+    if verbose:
+        print('Cluster count:', numCluster)
+
+    return [Clusters[i] for i in np.flatnonzero(active)]
+
+
+# Function to run CURE
+def runCURE(data, numRepPoints, alpha, numDesCluster, dtype=np.float32, verbose=False, useIndex=False):
+    data = np.ascontiguousarray(data, dtype=dtype)
+    numPts = len(data)
+
+    Clusters = [CureCluster(idPoint, data[idPoint, :]) for idPoint in range(numPts)]
+    Clusters = _mergeClusters(Clusters, numRepPoints, alpha, numDesCluster, verbose, search=_searchClass(useIndex))
+
+    Label = np.zeros(numPts, dtype=int)
+    for i in range(len(Clusters)):
+        Label[Clusters[i].index] = i + 1
+
+    return Clusters, Label
+
+
+# Satu kali run CURE sampai tersisa minCluster klaster, hasilnya riwayat merge
+# (dendrogram) berukuran (numPts - minCluster) x 2. Label untuk setiap k >= minCluster
+# bisa diambil dengan labelsFromDendrogram tanpa training ulang.
+def runCUREDendrogram(data, numRepPoints, alpha, minCluster=1, dtype=np.float32, verbose=False):
+    data = np.ascontiguousarray(data, dtype=dtype)
+    Clusters = [CureCluster(idPoint, data[idPoint, :]) for idPoint in range(len(data))]
+    merges = []
+    _mergeClusters(Clusters, numRepPoints, alpha, minCluster, verbose, history=merges)
+    return np.array(merges, dtype=np.intp).reshape(-1, 2)
+
+
+# Label 1..numCluster dari riwayat merge, identik dengan label runCURE(..., numCluster)
+def labelsFromDendrogram(merges, numPts, numCluster):
+    numMerge = numPts - numCluster
+    if numCluster < 1 or numMerge > len(merges):
+        raise ValueError(f"Dendrogram tidak mencakup {numCluster} klaster")
+
+    parent = np.arange(numPts)
+    parent[merges[:numMerge, 1]] = merges[:numMerge, 0]
+    root = parent
+    while True:
+        nextRoot = parent[root]
+        if np.array_equal(nextRoot, root):
+            break
+        root = nextRoot
+
+    # nomor klaster mengikuti urutan slot klaster yang masih aktif, seperti runCURE
+    return np.searchsorted(np.unique(root), root) + 1
+
+
+# CURE untuk data besar (sampling + partisi + partial clustering).
+# memoryBudget membatasi jumlah klaster yang ditangani sekaligus oleh satu
+# pemanggilan _mergeClusters; seluruh data kemudian diberi label oleh labelData.
+def runCURELarge(data, numRepPoints, alpha, numDesCluster, sampleSize=5000, reduceFactor=3,
+                 memoryBudget=MEMORY_BUDGET_BYTES, dtype=np.float32, seed=None, verbose=False, useIndex=False):
+    numPts, numDim = data.shape
+    itemSize = np.dtype(dtype).itemsize
+    bytesPerCluster = (numRepPoints + 2) * numDim * itemSize + numRepPoints ** 2 * 8 + 64
+    maxClusters = int(memoryBudget // bytesPerCluster)
+
+    sampleSize = min(sampleSize, numPts)
+    if sampleSize // reduceFactor > maxClusters or maxClusters <= numDesCluster:
+        raise ValueError("memoryBudget terlalu kecil untuk sampleSize dan reduceFactor ini")
+
+    # sampel acak, baris dibaca berurutan agar ramah untuk np.memmap
+    rng = np.random.default_rng(seed)
+    sampleIdx = np.sort(rng.choice(numPts, size=sampleSize, replace=False))
+    sample = np.ascontiguousarray(data[sampleIdx], dtype=dtype)
+
+    numPartitions = -(-sampleSize // maxClusters)
+    partial = []
+    for part in np.array_split(rng.permutation(sampleSize), numPartitions):
+        part = np.sort(part)
+        Clusters = [CureCluster(sampleIdx[i], sample[i, :]) for i in part]
+        target = max(numDesCluster, len(part) // reduceFactor)
+        partial.extend(_mergeClusters(Clusters, numRepPoints, alpha, target, verbose, search=_searchClass(useIndex)))
+
+    # urutkan seperti runCURE (index titik terbesar). Karena training memakai sampel,
+    # nomor klaster bisa berbeda dengan runCURE pada data yang sama; label untuk
+    # save_bundle diambil dengan bundle.match_cluster_labels, bukan dari nomornya.
+    Clusters = _mergeClusters(partial, numRepPoints, alpha, numDesCluster, verbose, search=_searchClass(useIndex))
+    return sorted(Clusters, key=lambda clust: np.max(clust.index))
+
+
+# Beri label seluruh data (1..k) dalam satu pass per blok baris terhadap titik rep
+# hasil training atau isi cure_model.pkl: klaster dengan titik rep terdekat.
+def labelData(data, rep_points, memoryBudget=MEMORY_BUDGET_BYTES):
+    allReps = np.vstack(rep_points)
+    repCluster = np.repeat(np.arange(1, len(rep_points) + 1), [len(reps) for reps in rep_points])
+
+    numPts = len(data)
+    blockRows = max(1, int(memoryBudget // (8 * len(allReps) + 8 * data.shape[1])))
+    Label = np.empty(numPts, dtype=int)
+    for start in range(0, numPts, blockRows):
+        stop = min(start + blockRows, numPts)
+        sq = cdist(np.asarray(data[start:stop], dtype=allReps.dtype), allReps, 'sqeuclidean')
+        Label[start:stop] = repCluster[sq.argmin(axis=1)]
+
+    return Label
+
+
+def save_model(clusters, filename='cure_model.pkl'):
+    rep_points = []
+    for cluster in clusters:
+        rep_points.append(cluster.repPoints)
+    joblib.dump(rep_points, filename)
+
+
+def load_model(filename='cure_model.pkl'):
+    return joblib.load(filename)
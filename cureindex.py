@@ -0,0 +1,139 @@
+# Mode useIndex untuk cure._mergeClusters: kandidat jarak dipersempit dengan
+# KD-tree atas titik rep klaster yang masih aktif, hasil merge tetap identik
+# dengan ExactSearch. Perbandingan waktu: benchmarks/ann.py; pada data 14 fitur
+# ini baru lebih cepat dari pencarian eksak di atas +-10.000 baris.
+import itertools
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from cure import ExactSearch, _distToClusters
+
+# jumlah kandidat awal per titik rep, dan toleransi relatif radius agar
+# jarak yang seri tetap ikut dibandingkan
+INDEX_NEIGHBORS = 4
+INDEX_SLACK = 1 + 1e-6
+
+
+# Indeks KD-tree atas klaster aktif. Jarak distRep selalu >= batas bawah
+# berikut, sehingga klaster di luar radius bisa dilewati tanpa
+# mengubah hasil (tetap eksak). Dengan m = jumlah rep, c = rata-rata rep dan
+# S = jumlah kuadrat jarak rep ke c: sum_b |a - b|^2 = m |a - c|^2 + S, jadi
+#   klaster tunggal w     : min_a |a - titik w|                (a = rep u)
+#   w hasil merge, u self : sqrt(m) x min_a |a - c_w|
+#   w hasil merge, w self : sqrt(m_u |b - c_u|^2 + S_u)         (b = rep w)
+# cKDTree tidak bisa diubah, jadi entri klaster yang sudah di-merge ditandai
+# basi (lastMerge berbeda dengan saat dibangun); klaster yang berubah sejak build
+# selalu ikut jadi kandidat, dan tree dibangun ulang setiap rebuildAfter merge.
+class LiveRepIndex:
+    def __init__(self, reps, lastMerge, active, rebuildAfter=16):
+        self.reps = reps
+        self.rebuildAfter = rebuildAfter
+        self.singleOwner = np.empty(0, dtype=np.intp)
+        self.rebuild(lastMerge, active)
+
+    def _reps(self, u, lastMerge):
+        return self.reps[u] if lastMerge[u] >= 0 else self.reps[u, :1]
+
+    def rebuild(self, lastMerge, active):
+        # titik klaster tunggal tidak pernah berubah, tree cukup dibangun ulang
+        # setelah sebagian besar isinya sudah di-merge
+        single = np.flatnonzero(active & (lastMerge < 0))
+        if len(single) < len(self.singleOwner) // 2 or len(self.singleOwner) == 0:
+            self.singleOwner = single
+            self.singleTree = cKDTree(self.reps[single, 0]) if len(single) else None
+
+        merged = np.flatnonzero(active & (lastMerge >= 0))
+        numRep = self.reps.shape[1]
+        self.mergedOwner = merged
+        self.repOwner = np.repeat(merged, numRep)
+        self.keyTree = cKDTree(self.reps[merged].mean(axis=1, dtype=np.float64)) if len(merged) else None
+        self.repTree = cKDTree(self.reps[merged].reshape(-1, self.reps.shape[2])) if len(merged) else None
+        self.pending = set()
+
+    # klaster u baru hasil merge (titik rep berubah)
+    def update(self, u, lastMerge, active):
+        self.pending.add(u)
+        if len(self.pending) >= self.rebuildAfter:
+            self.rebuild(lastMerge, active)
+
+    def _result(self, u, parts, lastMerge, active):
+        singles, keyIdx, repIdx = parts
+        parts = [
+            singles[active[singles] & (lastMerge[singles] < 0)],
+            self.mergedOwner[keyIdx],
+            self.repOwner[repIdx],
+            np.fromiter(self.pending, dtype=np.intp, count=len(self.pending)),
+        ]
+        result = np.unique(np.concatenate(parts))
+        result = result[active[result]]
+        return result[result != u]
+
+    @staticmethod
+    def _flat(idx):
+        return np.fromiter(itertools.chain.from_iterable(idx), dtype=np.intp)
+
+    # kandidat awal (untuk batas atas): `neighbors` entri terdekat di tiap tree
+    def nearby(self, u, neighbors, lastMerge, active):
+        repsU = self._reps(u, lastMerge)
+        center = repsU.mean(axis=0, dtype=np.float64)
+        empty = np.empty(0, dtype=np.intp)
+        singles, keyIdx, repIdx = empty, empty, empty
+        if self.singleTree is not None:
+            _, idx = self.singleTree.query(repsU, k=min(neighbors, len(self.singleOwner)))
+            singles = self.singleOwner[np.ravel(idx)]
+        if self.keyTree is not None:
+            _, keyIdx = self.keyTree.query(repsU, k=min(neighbors, len(self.mergedOwner)))
+            _, repIdx = self.repTree.query(center, k=min(neighbors, len(self.repOwner)))
+            keyIdx, repIdx = np.ravel(keyIdx), np.ravel(repIdx)
+        return self._result(u, [singles, keyIdx, repIdx], lastMerge, active)
+
+    # semua klaster yang batas bawah jaraknya ke u <= radius; selfOnly jika u
+    # pasti klaster "self" (baru saja di-merge)
+    def around(self, u, radius, lastMerge, active, selfOnly=False):
+        repsU = self._reps(u, lastMerge)
+        empty = np.empty(0, dtype=np.intp)
+        singles, keyIdx, repIdx = empty, empty, empty
+        if self.singleTree is not None:
+            singles = self.singleOwner[self._flat(self.singleTree.query_ball_point(repsU, radius, return_sorted=False))]
+        if self.keyTree is not None:
+            numRep = self.reps.shape[1]
+            keyIdx = self._flat(self.keyTree.query_ball_point(repsU, radius / np.sqrt(numRep), return_sorted=False))
+            if not selfOnly:
+                center = repsU.mean(axis=0, dtype=np.float64)
+                spread = np.square(repsU - center).sum()
+                if radius ** 2 > spread:
+                    repIdx = np.asarray(self.repTree.query_ball_point(
+                        center, np.sqrt((radius ** 2 - spread) / len(repsU)), return_sorted=False), dtype=np.intp)
+        return self._result(u, [singles, keyIdx, repIdx], lastMerge, active)
+
+
+class IndexedSearch(ExactSearch):
+    def __init__(self, reps, lastMerge, active, nnDist):
+        super().__init__(reps, lastMerge, active, nnDist)
+        self.index = LiveRepIndex(reps, lastMerge, active)
+
+    # batas atas dari beberapa kandidat terdekat, lalu semua klaster yang
+    # batas bawahnya masih di bawah batas atas itu
+    def nearest(self, u):
+        others = self.index.nearby(u, INDEX_NEIGHBORS, self.lastMerge, self.active)
+        if len(others) == 0:
+            others = self.others(u)
+        distU = _distToClusters(u, others, self.reps, self.lastMerge)
+        others = self.index.around(u, distU.min() * INDEX_SLACK, self.lastMerge, self.active)
+        return others, _distToClusters(u, others, self.reps, self.lastMerge)
+
+    # tetangga terdekat u, dan klaster yang mungkin lebih dekat ke u daripada
+    # tetangganya sekarang (nnDist <= radius lewat ball query, sisanya yang
+    # nnDist-nya besar dicek semua)
+    def mergeCandidates(self, u):
+        candidates, distNN = self.nearest(u)
+        live = self.others(u)
+        numFar = min(len(live), max(INDEX_NEIGHBORS, len(live) // 64))
+        radius = max(distNN.min() * INDEX_SLACK, np.partition(self.nnDist[live], len(live) - numFar)[len(live) - numFar])
+        far = live[self.nnDist[live] >= radius]
+        around = self.index.around(u, radius, self.lastMerge, self.active, selfOnly=True)
+        return np.union1d(np.union1d(candidates, far), around)
+
+    def update(self, u):
+        self.index.update(u, self.lastMerge, self.active)
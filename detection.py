@@ -0,0 +1,79 @@
+# Fungsi deteksi untuk halaman "Deteksi Malnutrisi". Modul ini (beserta
+# pandas, numpy, scipy dan bundle model) hanya diimpor saat halaman itu dibuka.
+import pandas as pd
+
+import metrics
+from artifacts import load_cached
+from bundle import load_bundle
+from preprocessing import encode
+
+# scaler, titik rep dan label klaster dalam satu bundle (lihat bundle.py)
+def load_model(filename='cure_model.bundle'):
+    return load_cached(filename, load_bundle)
+
+def detect_new_data(new_data_scaled, model):
+    return detect_clusters(new_data_scaled, model)[0]
+
+def detect_clusters(data_scaled, model):
+    with metrics.timer("assign"):
+        return model.assign(data_scaled)
+
+def intervensi(label):
+    if label == "Malnutrisi Berat":
+        return (
+            "### Klaster Malnutrisi Berat:\n"
+            "**Intervensi:**\n"
+            "- Pendekatan medis yang intensif, termasuk evaluasi komprehensif oleh dokter, ahli gizi, dan tim medis terkait.\n"
+            "- Pemberian nutrisi melalui metode enteral atau parenteral sesuai kebutuhan, untuk memastikan asupan nutrisi yang tepat bagi pasien.\n"
+            "- Terapi fisik dan intervensi mobilitas yang bertahap guna membantu meningkatkan kekuatan fisik.\n"
+            "- Konseling psikologis untuk mengelola stres, depresi, atau kecemasan yang dapat memperburuk kondisi malnutrisi.\n"
+        )
+    elif label == "Malnutrisi Ringan":
+        return (
+            "### Klaster Malnutrisi Ringan:\n"
+            "**Intervensi:**\n"
+            "- Pengaturan pola makan yang lebih seimbang dan bervariasi untuk mencegah malnutrisi lebih lanjut.\n"
+            "- Kegiatan fisik ringan yang teratur untuk menjaga kesehatan fisik dan mobilitas.\n"
+            "- Konseling psikologis ringan, jika diperlukan, untuk membantu manajemen stres.\n"
+            "- Pengawasan berkala terhadap status gizi untuk memastikan stabilitas kondisi.\n"
+        )
+    elif label == "Cukup Gizi":
+        return (
+            "### Klaster Cukup Gizi:\n"
+            "**Intervensi:**\n"
+            "- Pemeliharaan gizi dengan pola makan yang seimbang dan aktivitas fisik teratur.\n"
+            "- Konsultasi berkala dengan ahli gizi untuk memastikan asupan nutrisi tetap optimal.\n"
+            "- Pemantauan kondisi kesehatan secara teratur untuk mendeteksi perubahan status gizi atau kondisi fisik.\n"
+        )
+    else:
+        return "Klaster tidak diketahui."
+
+def score_batch(data, model):
+    hasil = data.copy()
+    with metrics.timer("preprocess"):
+        data_preprocessed, unknown = encode(data)
+
+    # baris dengan nilai kosong atau kategori yang tidak dikenal tidak diberi klaster
+    lengkap = data_preprocessed.notna().all(axis=1).to_numpy()
+    klaster = pd.Series(pd.NA, index=data.index, dtype="Int64")
+    if lengkap.any():
+        with metrics.timer("scale"):
+            data_scaled = model.transform(data_preprocessed[lengkap])
+        klaster[lengkap] = detect_clusters(data_scaled, model)
+    metrics.count("records_scored", int(lengkap.sum()))
+    metrics.count("records_incomplete", int((~lengkap).sum()))
+
+    teks = {c: intervensi(model.labels.get(c)).replace("### ", "").replace("**", "") for c in klaster.dropna().unique()}
+    hasil["Klaster"] = klaster
+    hasil["Status"] = klaster.map(model.labels)
+    hasil["Intervensi"] = klaster.map(teks).fillna("Data tidak lengkap atau kategori tidak dikenali.")
+    return hasil, unknown
+
+# file rusak/format salah dilaporkan sebagai ValueError agar bisa ditampilkan di halaman
+def read_upload(uploaded_file):
+    try:
+        if uploaded_file.name.lower().endswith(".csv"):
+            return pd.read_csv(uploaded_file)
+        return pd.read_excel(uploaded_file, engine="openpyxl")
+    except Exception as e:
+        raise ValueError(f"File {uploaded_file.name} tidak dapat dibaca: {e}") from e
@@ -0,0 +1,147 @@
+# Pembaruan model CURE secara bertahap dengan data skrining baru, tanpa
+# menjalankan ulang notebook.
+#
+#   python incremental.py init                 # state awal dari scaled_data.npy + bundle
+#   python incremental.py update [data_baru.csv]
+#
+# State training (titik data, pusat dan titik rep tiap klaster) disimpan di
+# cure_state.pkl. Data baru diberi klaster dengan titik rep terdekat (sama seperti
+# aplikasi), ditambahkan ke klaster tersebut, dan titik rep hanya dihitung ulang
+# untuk klaster yang pusatnya sudah bergeser (CureCluster.drift). Scaler tidak
+# diubah agar ruang fitur tetap sama dengan model yang di-deploy.
+import argparse
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from bundle import DEFAULT_BUNDLE, load_bundle, save_bundle
+from cure import runCURE
+from preprocessing import FEATURES, encode
+from projection import DEFAULT_PROJECTION, build_projection, save_projection
+from scoring import RepIndex
+from streaming import load_scaled
+
+STATE_FILE = 'cure_state.pkl'
+# hasil skrining dari aplikasi yang menunggu untuk dimasukkan ke model
+PENDING_FILE = 'data_baru.csv'
+
+# parameter CURE yang dipakai notebook
+NUM_REP_POINTS = 5
+ALPHA = 0.3
+DRIFT_THRESHOLD = 0.1
+
+_pending_lock = threading.Lock()
+
+
+def save_state(clusters, filename=STATE_FILE):
+    joblib.dump(clusters, filename)
+
+
+def load_state(filename=STATE_FILE):
+    return joblib.load(filename)
+
+
+# State awal dari data training; titik rep diambil dari model yang di-deploy
+# agar hasil deteksi tidak berubah sebelum ada data baru.
+def init_state(scaled_data, rep_points, num_rep_points=NUM_REP_POINTS, alpha=ALPHA):
+    clusters, _ = runCURE(scaled_data, num_rep_points, alpha, len(rep_points), dtype=np.float64)
+    for cluster, reps in zip(clusters, rep_points):
+        cluster.repPoints = np.array(reps, dtype=np.float64)
+        cluster.repCenter = cluster.center.copy()
+    return clusters
+
+
+# Tambahkan data baru (sudah di-scale) ke klaster dengan titik rep terdekat.
+# Return (nomor klaster tiap baris, daftar klaster yang titik rep-nya dihitung ulang).
+def update_clusters(clusters, data_scaled, num_rep_points=NUM_REP_POINTS, alpha=ALPHA,
+                    drift_threshold=DRIFT_THRESHOLD):
+    data_scaled = np.atleast_2d(np.asarray(data_scaled, dtype=np.float64))
+    assigned = RepIndex.from_rep_points([cluster.repPoints for cluster in clusters]).assign(data_scaled)
+
+    start = max(np.max(cluster.index) for cluster in clusters) + 1
+    index = np.arange(start, start + len(data_scaled))
+    regenerated = []
+    for cluster_id in np.unique(assigned):
+        mask = assigned == cluster_id
+        if clusters[cluster_id - 1].addPoints(data_scaled[mask], index[mask], num_rep_points, alpha, drift_threshold):
+            regenerated.append(int(cluster_id))
+    return assigned, regenerated
+
+
+# Data mentah (kolom seperti data.csv) -> update state, lalu tulis ulang bundle
+# dan proyeksi halaman Visualisasi jika ada titik rep yang berubah. Baris yang
+# tidak lengkap dilewati.
+def update_model(data, state_file=STATE_FILE, bundle_file=DEFAULT_BUNDLE, num_rep_points=NUM_REP_POINTS,
+                 alpha=ALPHA, drift_threshold=DRIFT_THRESHOLD, projection_file=DEFAULT_PROJECTION):
+    model = load_bundle(bundle_file)
+    encoded, unknown = encode(data)
+    lengkap = encoded.notna().all(axis=1).to_numpy()
+
+    clusters = load_state(state_file)
+    assigned, regenerated = update_clusters(
+        clusters, model.transform(encoded[lengkap]), num_rep_points, alpha, drift_threshold
+    )
+    save_state(clusters, state_file)
+    if regenerated:
+        save_bundle(bundle_file, [cluster.repPoints for cluster in clusters], model.mean, model.scale,
+                    model.labels, model.features)
+        points = np.vstack([cluster.points for cluster in clusters])
+        save_projection(build_projection(points, load_bundle(bundle_file)), projection_file)
+
+    return {
+        'added': int(lengkap.sum()),
+        'skipped': int((~lengkap).sum()),
+        'unknown': unknown,
+        'per_cluster': {int(c): int(n) for c, n in zip(*np.unique(assigned, return_counts=True))},
+        'regenerated': regenerated,
+        'drift': {i: float(cluster.drift()) for i, cluster in enumerate(clusters, start=1)},
+    }
+
+
+# Simpan data skrining dari aplikasi untuk update berikutnya; hanya kolom
+# fitur yang disimpan (tanpa Nama)
+def append_pending(data, filename=PENDING_FILE):
+    with _pending_lock:
+        data[FEATURES].to_csv(filename, mode='a', header=not os.path.exists(filename), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pembaruan model CURE dengan data baru")
+    parser.add_argument('command', choices=['init', 'update'])
+    parser.add_argument('data', nargs='?', default=PENDING_FILE, help="CSV data baru (untuk update)")
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--bundle', default=DEFAULT_BUNDLE)
+    parser.add_argument('--scaled-data', default='scaled_data.npy', help="data training (untuk init)")
+    parser.add_argument('--drift-threshold', type=float, default=DRIFT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        model = load_bundle(args.bundle)
+        clusters = init_state(load_scaled(args.scaled_data), model.rep_points)
+        save_state(clusters, args.state)
+        print(f"State disimpan ke {args.state}: {[len(cluster.index) for cluster in clusters]} titik per klaster")
+        return
+
+    if not os.path.exists(args.data):
+        print(f"Tidak ada data baru ({args.data})")
+        return
+
+    # file diberi nama baru sebelum dibaca: baris yang ditambahkan aplikasi
+    # setelah ini masuk ke file baru dan diproses pada update berikutnya
+    root, ext = os.path.splitext(args.data)
+    batch_file = f"{root}_{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+    os.replace(args.data, batch_file)
+    try:
+        summary = update_model(pd.read_csv(batch_file), args.state, args.bundle, drift_threshold=args.drift_threshold)
+    except Exception:
+        print(f"Update gagal; data ada di {batch_file}, jalankan ulang: python incremental.py update {batch_file}")
+        raise
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+# Scoring dengan tabel lookup untuk re-scoring data dalam jumlah besar.
+# Sepuluh fitur kategori hanya punya 2-3 kode (total 17.496 kombinasi), jadi
+# untuk setiap kombinasi dihitung sekali:
+#   offset[kombinasi, rep]      jumlah kuadrat selisih fitur kategori (sudah di-scale)
+#   candidates[kombinasi, rep]  titik rep yang masih mungkin jadi yang terdekat
+# Saat assign hanya 4 fitur kontinu yang dihitung (satu perkalian matriks n x 4
+# dengan titik rep), ditambah isi tabel untuk kombinasi baris tersebut.
+# Hasil identik dengan ModelBundle.assign(ModelBundle.transform(data)); baris yang
+# jaraknya hampir seri atau di luar CONTINUOUS_BOUNDS dihitung ulang dengan cara biasa.
+import itertools
+
+import numpy as np
+
+from preprocessing import CODEBOOK
+
+# Rentang nilai fitur kontinu (satuan asli) yang dipakai untuk menyaring titik
+# rep kandidat; baris di luar rentang ini tetap benar, hanya lebih lambat
+CONTINUOUS_BOUNDS = {
+    'Umur': (45, 120),
+    'Berat_Badan': (20, 200),
+    'Tinggi_Badan': (100, 220),
+    'Penurunan_Berat_Badan': (0, 30),
+}
+# Selisih relatif jarak kuadrat yang dianggap seri
+TIE_TOLERANCE = 1e-9
+# Batas memori (byte) untuk array sementara per blok baris
+BLOCK_BYTES = 8 * 1024 * 1024
+
+
+class LookupScorer:
+    def __init__(self, model, bounds=CONTINUOUS_BOUNDS):
+        self.model = model
+        features = list(model.features)
+        reps = np.asarray(model.reps, dtype=np.float64)
+
+        self.categorical = [features.index(kolom) for kolom in CODEBOOK]
+        self.continuous = [i for i in range(len(features)) if i not in self.categorical]
+        missing = [features[i] for i in self.continuous if features[i] not in bounds]
+        if missing:
+            raise ValueError(f"Rentang fitur kontinu tidak diketahui: {', '.join(missing)}")
+
+        # posisi kode di dalam daftar kode tiap kolom -> nomor kombinasi (mixed radix)
+        codes = [np.array(sorted(CODEBOOK[features[i]].values())) for i in self.categorical]
+        self.radix = np.array([len(c) for c in codes])
+        self.stride = np.concatenate([np.cumprod(self.radix[::-1])[::-1][1:], [1]])
+        self.position = []
+        for c in codes:
+            position = np.full(c.max() + 1, -1, dtype=np.intp)
+            position[c] = np.arange(len(c))
+            self.position.append(position)
+
+        combos = np.array(list(itertools.product(*codes)), dtype=np.float64)
+        cat = (combos - model.mean[self.categorical]) / model.scale[self.categorical]
+        reps_cat = reps[:, self.categorical]
+        self.offset = np.empty((len(cat), len(reps)))
+        block_rows = max(1, BLOCK_BYTES // (8 * reps_cat.size))
+        for start in range(0, len(cat), block_rows):
+            block = cat[start:start + block_rows]
+            self.offset[start:start + block_rows] = np.square(block[:, None, :] - reps_cat[None, :, :]).sum(axis=2)
+
+        self.reps_cont = reps[:, self.continuous]
+        self.mean_cont = model.mean[self.continuous]
+        self.scale_cont = model.scale[self.continuous]
+        low, high = np.array([bounds[features[i]] for i in self.continuous], dtype=np.float64).T
+        self.low = (low - self.mean_cont) / self.scale_cont
+        self.high = (high - self.mean_cont) / self.scale_cont
+        self.candidates = self._candidates()
+
+        # tabel per kombinasi: offset + |r|^2 untuk rep kandidat, inf untuk yang dibuang;
+        # rep yang tidak pernah jadi kandidat dihapus dari kolom tabel
+        used = self.candidates.any(axis=0)
+        table = np.where(self.candidates, self.offset + np.square(self.reps_cont).sum(axis=1), np.inf)
+        self.table = np.ascontiguousarray(table[:, used])
+        self.table_max = np.where(np.isinf(self.table), 0, self.table).max(axis=1)
+        self.reps_cont = np.ascontiguousarray(self.reps_cont[used])
+        self.cluster_ids = np.asarray(model.cluster_ids)[used]
+
+    def __repr__(self):
+        return (f"LookupScorer({len(self.table)} kombinasi, rata-rata "
+                f"{self.candidates.sum(axis=1).mean():.1f}/{self.candidates.shape[1]} titik rep kandidat)")
+
+    # Titik rep r dibuang untuk suatu kombinasi jika ada rep s yang selalu lebih
+    # dekat di seluruh kotak [low, high]. Selisih d_r^2 - d_s^2 linear terhadap
+    # fitur kontinu x, jadi minimumnya di salah satu sudut kotak:
+    #   offset_r - offset_s + |r|^2 - |s|^2 + sum_j min(2 x_j (s_j - r_j)), x_j di {low_j, high_j}
+    def _candidates(self):
+        reps = self.reps_cont
+        norm = np.square(reps).sum(axis=1)
+        diff = 2 * (reps[None, :, :] - reps[:, None, :])  # [r, s] = 2 (s - r)
+        corner = np.minimum(diff * self.low, diff * self.high).sum(axis=2) + norm[:, None] - norm[None, :]
+
+        # margin berukuran kombinasi x rep x rep, dihitung per blok kombinasi
+        # agar memori tetap kecil untuk model dengan banyak titik rep
+        keep = np.empty(self.offset.shape, dtype=bool)
+        block_rows = max(1, BLOCK_BYTES // (8 * len(reps) ** 2))
+        for start in range(0, len(self.offset), block_rows):
+            offset = self.offset[start:start + block_rows]
+            margin = offset[:, :, None] - offset[:, None, :] + corner[None, :, :]
+            keep[start:start + block_rows] = ~(margin > TIE_TOLERANCE * (1 + np.abs(offset[:, :, None]))).any(axis=2)
+        return keep
+
+    # nomor kombinasi tiap baris dari kode kategori (belum di-scale)
+    def combination(self, encoded):
+        combo = np.zeros(len(encoded), dtype=np.intp)
+        for j, i in enumerate(self.categorical):
+            column = encoded[:, i]
+            code = column.astype(np.intp)
+            valid = (code == column) & (code >= 0) & (code < len(self.position[j]))
+            position = np.where(valid, self.position[j][np.where(valid, code, 0)], -1)
+            if (position < 0).any():
+                raise ValueError(f"Kode kategori tidak dikenal di kolom {self.model.features[i]}")
+            combo += position * self.stride[j]
+        return combo
+
+    # nomor klaster (1..k) untuk data hasil preprocess_data (urutan FEATURES, belum di-scale)
+    def assign(self, encoded):
+        encoded = np.atleast_2d(np.asarray(encoded, dtype=np.float64))
+        if np.isnan(encoded).any():
+            raise ValueError("Data berisi nilai kosong")
+        result = np.empty(len(encoded), dtype=self.cluster_ids.dtype)
+        block_rows = max(1, BLOCK_BYTES // (8 * (2 * self.table.shape[1] + encoded.shape[1])))
+        for start in range(0, len(encoded), block_rows):
+            block = encoded[start:start + block_rows]
+            result[start:start + block_rows] = self._assign_block(block)
+        return result
+
+    # d^2 = |x|^2 - 2 x.r + (offset + |r|^2); suku |x|^2 sama untuk semua rep
+    def _assign_block(self, encoded):
+        combo = self.combination(encoded)
+        x = (encoded[:, self.continuous] - self.mean_cont) / self.scale_cont
+        score = self.table[combo] - 2 * (x @ self.reps_cont.T)
+        nearest = score.argmin(axis=1)
+
+        # jarak yang hampir seri dan baris di luar kotak kandidat dihitung ulang dengan jalur biasa
+        if score.shape[1] > 1:
+            best, second = np.partition(score, 1, axis=1)[:, :2].T
+            size = 1 + np.square(x).sum(axis=1) + self.table_max[combo]
+            recheck = second - best <= TIE_TOLERANCE * size
+        else:
+            recheck = np.zeros(len(score), dtype=bool)
+        recheck |= ((x < self.low) | (x > self.high)).any(axis=1)
+        clusters = self.cluster_ids[nearest]
+        if recheck.any():
+            clusters[recheck] = self.model.assign(self.model.transform(encoded[recheck]))
+        return clusters
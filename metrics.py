@@ -0,0 +1,116 @@
+# Metrik per proses untuk pipeline deteksi: durasi tiap tahap (jumlah, total,
+# persentil dari jendela terakhir), counter, dan info model yang sedang dipakai.
+# Hanya memakai library standar agar bisa diimpor di setiap rerun Streamlit.
+#
+# Matikan dengan environment variable MALNUTRISI_METRICS=0. Setiap durasi juga
+# dikirim sebagai log JSON ke logger "malnutrisi.metrics" (level INFO) jika
+# logger tersebut diaktifkan.
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('MALNUTRISI_METRICS', '1') != '0'
+# jumlah durasi terakhir per tahap untuk persentil
+WINDOW = 1000
+QUANTILES = (0.5, 0.9, 0.99)
+
+logger = logging.getLogger('malnutrisi.metrics')
+
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_info = {}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def observe(stage, seconds):
+    if not ENABLED:
+        return
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = {'count': 0, 'sum': 0.0, 'recent': deque(maxlen=WINDOW)}
+        entry['count'] += 1
+        entry['sum'] += seconds
+        entry['recent'].append(seconds)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({'event': 'stage', 'stage': stage, 'seconds': seconds, 'ts': time.time()}))
+
+
+@contextmanager
+def timer(stage):
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def count(name, value=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+# label info, misalnya file dan sha256 model yang sedang dimuat
+def set_info(name, **labels):
+    with _lock:
+        _info[name] = {k: str(v) for k, v in labels.items()}
+
+
+def snapshot():
+    with _lock:
+        stages = {
+            stage: {
+                'count': entry['count'],
+                'sum': entry['sum'],
+                **{f'p{int(q * 100)}': percentile(entry['recent'], q) for q in QUANTILES},
+            }
+            for stage, entry in _stages.items()
+        }
+        return {'stages': stages, 'counters': dict(_counters), 'info': {k: dict(v) for k, v in _info.items()}}
+
+
+def _labels(labels):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+# Format teks Prometheus (summary per tahap, counter, dan *_info bernilai 1)
+def prometheus_text(prefix='malnutrisi'):
+    data = snapshot()
+    lines = [
+        f'# HELP {prefix}_stage_seconds Durasi tahap pipeline deteksi (kuantil dari {WINDOW} durasi terakhir).',
+        f'# TYPE {prefix}_stage_seconds summary',
+    ]
+    for stage, entry in sorted(data['stages'].items()):
+        for q in QUANTILES:
+            lines.append(f'{prefix}_stage_seconds{_labels({"stage": stage, "quantile": q})} {entry[f"p{int(q * 100)}"]}')
+        lines.append(f'{prefix}_stage_seconds_sum{_labels({"stage": stage})} {entry["sum"]}')
+        lines.append(f'{prefix}_stage_seconds_count{_labels({"stage": stage})} {entry["count"]}')
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f'# TYPE {prefix}_{name}_total counter')
+        lines.append(f'{prefix}_{name}_total {value}')
+    for name, labels in sorted(data['info'].items()):
+        lines.append(f'# TYPE {prefix}_{name}_info gauge')
+        lines.append(f'{prefix}_{name}_info{_labels(labels)} 1')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _info.clear()
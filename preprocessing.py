@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Codebook kategori -> kode numerik. Satu-satunya sumber mapping untuk
+# app.py dan notebook; urutan kolom mengikuti scaler.pkl.
+CODEBOOK = {
+    'Jenis_Kelamin': {'Perempuan': 1, 'Laki-laki': 0},
+    'Frekuensi_Makan': {
+        'Tiga kali atau lebih': 3,
+        'Dua kali': 2,
+        'Satu kali atau kurang': 1
+    },
+    'Variasi_Makanan': {
+        'Makanan bervariasi (misalnya daging, sayuran, buah)': 3,
+        'Makanan terbatas pada beberapa jenis saja': 2,
+        'Makanan sangat terbatas atau monoton': 1
+    },
+    'Asupan_Protein': {
+        'Dua kali sehari atau lebih': 3,
+        'Sekali sehari': 2,
+        'Kurang dari sekali sehari atau tidak pernah': 1
+    },
+    'Mobilitas': {
+        'Bergerak dengan bebas tanpa bantuan': 3,
+        'Bergerak dengan bantuan': 2,
+        'Tidak dapat bergerak tanpa bantuan orang lain': 1
+    },
+    'Aktivitas_Sehari_hari': {
+        'Tidak ada kesulitan': 3,
+        'Kesulitan ringan': 2,
+        'Kesulitan berat': 1
+    },
+    'Kesehatan_Mulut': {
+        'Tidak ada masalah': 3,
+        'Ada kesulitan ringan': 2,
+        'Kesulitan berat': 1,
+    },
+    'Penyakit_Kronis': {'Ya': 1, 'Tidak': 0},
+    'Stres': {'Ya': 1, 'Tidak': 0},
+    'Masalah_Kognitif': {
+        'Tidak ada masalah daya ingat': 3,
+        'Ada sedikit masalah daya ingat': 2,
+        'Masalah daya ingat yang signifikan': 1
+    },
+}
+
+FEATURES = [
+    'Umur', 'Jenis_Kelamin', 'Berat_Badan', 'Tinggi_Badan', 'Penurunan_Berat_Badan',
+    'Frekuensi_Makan', 'Variasi_Makanan', 'Asupan_Protein', 'Mobilitas', 'Aktivitas_Sehari_hari',
+    'Kesehatan_Mulut', 'Penyakit_Kronis', 'Stres', 'Masalah_Kognitif'
+]
+INPUT_COLUMNS = ['Nama'] + FEATURES
+
+
+class UnknownCategoryError(ValueError):
+    def __init__(self, unknown):
+        self.unknown = unknown
+        detail = "; ".join(f"{kolom}: {', '.join(map(repr, nilai))}" for kolom, nilai in unknown.items())
+        super().__init__(f"Kategori tidak dikenal: {detail}")
+
+
+def _encode_column(values, table):
+    # kode kategori per nilai unik, strip dan lookup hanya dilakukan pada nilai unik
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    keys = pd.Index(uniques, dtype=object).map(lambda x: x.strip() if isinstance(x, str) else x)
+    lookup = np.array([table.get(key, np.nan) for key in keys], dtype=np.float64)
+    encoded = np.where(codes >= 0, lookup[codes] if len(lookup) else np.nan, np.nan)
+    return encoded, [uniques[i] for i in np.flatnonzero(np.isnan(lookup))]
+
+
+def _numeric_column(values):
+    # pd.to_numeric sudah mengabaikan spasi di awal/akhir teks angka; inf, angka
+    # yang overflow dan boolean (mis. true dari JSON) juga dianggap tidak dikenal
+    encoded = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    invalid = ~np.isfinite(encoded) & values.notna().to_numpy()
+    if values.dtype == bool:
+        invalid[:] = True
+    elif values.dtype == object:
+        invalid |= values.map(lambda x: isinstance(x, (bool, np.bool_))).to_numpy(dtype=bool)
+    encoded[invalid] = np.nan
+    return encoded, list(pd.unique(values[invalid]))
+
+
+# Ubah data mentah (kolom seperti data.csv) jadi fitur numerik sesuai FEATURES.
+# Nilai kosong tetap NaN; nilai yang tidak dikenal juga jadi NaN dan
+# dilaporkan di `unknown` sebagai {kolom: [nilai, ...]}.
+def encode(data):
+    encoded = {}
+    unknown = {}
+    for kolom in FEATURES:
+        if kolom in CODEBOOK:
+            encoded[kolom], tidak_dikenal = _encode_column(data[kolom], CODEBOOK[kolom])
+        else:
+            encoded[kolom], tidak_dikenal = _numeric_column(data[kolom])
+        if tidak_dikenal:
+            unknown[kolom] = tidak_dikenal
+    return pd.DataFrame(encoded, index=data.index, columns=FEATURES), unknown
+
+
+def preprocess_data(data, errors='raise'):
+    encoded, unknown = encode(data)
+    if unknown and errors == 'raise':
+        raise UnknownCategoryError(unknown)
+    return encoded
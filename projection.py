@@ -0,0 +1,135 @@
+# Proyeksi 2D (PCA) data training untuk halaman "Visualisasi", dihitung sekali
+# dan disimpan di samping bundle model:
+#
+#   python projection.py [scaled_data.npy] [cure_model.bundle] [cure_model.projection.npz]
+#
+# PCA dihitung dari matriks kovarians yang diakumulasi per blok baris, jadi
+# scaled_data.npy (memmap) tidak perlu dimuat seluruhnya. Klaster tiap baris
+# diambil dari bundle model yang sedang di-deploy. Yang disimpan hanya sampel
+# titik (dibagi rata per klaster) agar grafik tetap ringan untuk ratusan ribu
+# baris, jumlah baris per klaster, dan sidik jari bundle untuk mendeteksi
+# proyeksi yang sudah basi setelah model diperbarui.
+import hashlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from artifacts import replace_file
+from bundle import DEFAULT_BUNDLE, load_bundle
+
+DEFAULT_PROJECTION = 'cure_model.projection.npz'
+# jumlah titik maksimal yang dikirim ke grafik
+MAX_POINTS = 5000
+BLOCK_ROWS = 100_000
+
+
+class Projection:
+    def __init__(self, mean, components, explained, points, clusters, counts, fingerprint):
+        self.mean = mean
+        self.components = components
+        self.explained = explained  # rasio varians yang dijelaskan tiap komponen
+        self.points = points  # sampel titik (n x 2)
+        self.clusters = clusters  # klaster tiap titik sampel
+        self.counts = counts  # {klaster: jumlah baris di seluruh data}
+        self.fingerprint = fingerprint
+
+    def __repr__(self):
+        return f"Projection({self.total} baris, {len(self.points)} titik sampel)"
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    # data yang sudah di-scale -> koordinat 2D
+    def transform(self, data_scaled):
+        data_scaled = np.atleast_2d(np.asarray(data_scaled, dtype=np.float64))
+        return (data_scaled - self.mean) @ self.components.T
+
+
+# sidik jari isi model (titik rep, scaler, klaster); berubah jika model diperbarui
+def model_fingerprint(model):
+    h = hashlib.sha256()
+    for array in (model.reps, model.mean, model.scale, model.cluster_ids):
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def _blocks(data):
+    for start in range(0, len(data), BLOCK_ROWS):
+        yield start, np.asarray(data[start:start + BLOCK_ROWS], dtype=np.float64)
+
+
+def build_projection(data_scaled, model, max_points=MAX_POINTS, seed=0):
+    num_rows = len(data_scaled)
+    total = np.zeros(data_scaled.shape[1])
+    cross = np.zeros((data_scaled.shape[1], data_scaled.shape[1]))
+    clusters = np.empty(num_rows, dtype=model.cluster_ids.dtype)
+    for start, block in _blocks(data_scaled):
+        total += block.sum(axis=0)
+        cross += block.T @ block
+        clusters[start:start + len(block)] = model.assign(block)
+    mean = total / num_rows
+    cov = cross / num_rows - np.outer(mean, mean)
+
+    # dua komponen utama, tanda dibuat tetap (elemen terbesar positif)
+    # agar gambar tidak terbalik setiap kali proyeksi dibuat ulang
+    eigval, eigvec = np.linalg.eigh(cov)
+    order = np.argsort(eigval)[::-1][:2]
+    components = eigvec[:, order].T
+    components *= np.sign(components[np.arange(2), np.abs(components).argmax(axis=1)])[:, None]
+    explained = eigval[order] / eigval.sum()
+
+    # sampel dibagi rata per klaster agar klaster kecil tetap terlihat
+    rng = np.random.default_rng(seed)
+    ids, counts = np.unique(clusters, return_counts=True)
+    quota = np.zeros(len(ids), dtype=np.intp)
+    remaining = max_points
+    for k, i in enumerate(np.argsort(counts)):
+        quota[i] = min(counts[i], remaining // (len(ids) - k))
+        remaining -= quota[i]
+    sample = np.sort(np.concatenate([
+        rng.choice(np.flatnonzero(clusters == c), size=q, replace=False) for c, q in zip(ids, quota)
+    ]))
+    points = (np.asarray(data_scaled[sample], dtype=np.float64) - mean) @ components.T
+
+    return Projection(mean, components, explained, points, clusters[sample],
+                      {int(c): int(n) for c, n in zip(ids, counts)}, model_fingerprint(model))
+
+
+def save_projection(projection, filename=DEFAULT_PROJECTION):
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f, mean=projection.mean, components=projection.components, explained=projection.explained,
+                points=projection.points, clusters=projection.clusters,
+                count_ids=np.array(list(projection.counts)), counts=np.array(list(projection.counts.values())),
+                fingerprint=np.array(projection.fingerprint),
+            )
+        os.chmod(tmp_name, 0o644)
+        replace_file(tmp_name, filename)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def load_projection(filename=DEFAULT_PROJECTION):
+    with np.load(filename) as f:
+        return Projection(
+            f['mean'], f['components'], f['explained'], f['points'], f['clusters'],
+            {int(c): int(n) for c, n in zip(f['count_ids'], f['counts'])}, str(f['fingerprint']),
+        )
+
+
+# Buat ulang proyeksi setelah model atau data training berubah
+if __name__ == '__main__':
+    from streaming import load_scaled
+
+    defaults = ['scaled_data.npy', DEFAULT_BUNDLE, DEFAULT_PROJECTION]
+    data_file, bundle_file, projection_file = sys.argv[1:4] + defaults[len(sys.argv[1:4]):]
+    projection = build_projection(load_scaled(data_file), load_bundle(bundle_file))
+    save_projection(projection, projection_file)
+    print(projection)
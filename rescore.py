@@ -0,0 +1,161 @@
+# Re-scoring seluruh registri lansia (jutaan baris) dengan beberapa proses.
+#
+#   python rescore.py data_registri.csv hasil.csv [--workers 4] [--chunk-mb 16]
+#
+# File input dibagi menjadi potongan byte yang berakhir di batas baris; setiap
+# worker membaca potongannya sendiri, lalu menjalankan preprocessing, scaling
+# dan assign titik rep terdekat (lookup.LookupScorer), dan mengembalikan hasilnya
+# sebagai teks CSV. Proses utama hanya menulis hasil sesuai urutan input,
+# jadi output ditulis bertahap tanpa menunggu seluruh file selesai.
+#
+# Titik rep tidak disalin ke tiap worker: bundle model dipetakan dengan
+# np.memmap (lihat bundle.load_bundle, kecuali di Windows), sehingga semua
+# worker memakai page cache yang sama. Input harus CSV satu baris per record (tanpa newline di
+# dalam nilai yang diberi tanda kutip), seperti data.csv.
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from bundle import DEFAULT_BUNDLE, load_bundle
+from lookup import LookupScorer
+from preprocessing import INPUT_COLUMNS, encode
+
+CHUNK_BYTES = 16 * 1024 * 1024
+OUTPUT_COLUMNS = ['Nama', 'Klaster', 'Status']
+
+# model per proses worker, dimuat sekali oleh _init_worker
+_model = None
+_scorer = None
+
+
+def _init_worker(bundle_file, use_lookup):
+    global _model, _scorer
+    _model = load_bundle(bundle_file)
+    _scorer = LookupScorer(_model) if use_lookup else None
+
+
+# potongan (start, stop) berukuran kira-kira chunk_bytes, berakhir di akhir baris
+def byte_ranges(filename, chunk_bytes=CHUNK_BYTES):
+    size = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        f.readline()  # header
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            stop = f.tell()
+            yield start, stop
+            start = stop
+
+
+# utf-8-sig: CSV dari Excel ("CSV UTF-8") diawali BOM
+def read_header(filename):
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f))
+
+
+def score_chunk(data, model, scorer=None):
+    encoded, _ = encode(data)
+    lengkap = encoded.notna().all(axis=1).to_numpy()
+    klaster = np.zeros(len(data), dtype=np.int64)
+    if lengkap.any():
+        if scorer is not None:
+            klaster[lengkap] = scorer.assign(encoded[lengkap])
+        else:
+            klaster[lengkap] = model.assign(model.transform(encoded[lengkap]))
+
+    hasil = data.copy()
+    # baris dengan nilai kosong atau kategori yang tidak dikenal tidak diberi klaster
+    hasil['Klaster'] = pd.Series(klaster, index=data.index, dtype='Int64').where(lengkap)
+    hasil['Status'] = hasil['Klaster'].map(model.labels)
+    return hasil, int(lengkap.sum())
+
+
+# dijalankan di worker: baca potongan file, score, kembalikan teks CSV tanpa header
+def _score_range(task):
+    filename, start, stop, columns, output_columns = task
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        raw = f.read(stop - start)
+    data = pd.read_csv(io.BytesIO(raw), header=None, names=columns, usecols=INPUT_COLUMNS, dtype={'Nama': str})
+    hasil, scored = score_chunk(data, _model, _scorer)
+    return hasil.to_csv(header=False, index=False, columns=output_columns), len(data), scored
+
+
+def rescore(filename, out, bundle_file=DEFAULT_BUNDLE, workers=None, chunk_bytes=CHUNK_BYTES, use_lookup=True,
+            keep_columns=False, progress=None):
+    columns = read_header(filename)
+    missing = [kolom for kolom in INPUT_COLUMNS if kolom not in columns]
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+    output_columns = INPUT_COLUMNS + OUTPUT_COLUMNS[1:] if keep_columns else OUTPUT_COLUMNS
+    tasks = ((filename, start, stop, columns, output_columns) for start, stop in byte_ranges(filename, chunk_bytes))
+
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(output_columns)
+    rows = scored = 0
+    started = time.perf_counter()
+
+    def write(results):
+        nonlocal rows, scored
+        for text, chunk_rows, chunk_scored in results:
+            out.write(text)
+            rows += chunk_rows
+            scored += chunk_scored
+            if progress is not None:
+                progress(rows, time.perf_counter() - started)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(bundle_file, use_lookup)
+        write(map(_score_range, tasks))
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(bundle_file, use_lookup)) as pool:
+            write(pool.imap(_score_range, tasks))
+
+    seconds = time.perf_counter() - started
+    return {
+        'rows': rows, 'scored': scored, 'incomplete': rows - scored, 'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else None, 'workers': workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-scoring data skrining dalam jumlah besar dengan beberapa proses")
+    parser.add_argument('data', help="CSV input (kolom seperti data.csv)")
+    parser.add_argument('out', nargs='?', default='-', help="CSV hasil, '-' untuk stdout")
+    parser.add_argument('--model', default=DEFAULT_BUNDLE)
+    parser.add_argument('--workers', type=int, default=None, help="jumlah proses (default: jumlah CPU)")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / 2**20, help="ukuran potongan input per tugas")
+    parser.add_argument('--no-lookup', dest='lookup', action='store_false',
+                        help="assign dengan ModelBundle.assign, bukan LookupScorer")
+    parser.add_argument('--keep-columns', action='store_true', help="tulis semua kolom input, bukan hanya Nama")
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args()
+
+    def progress(rows, seconds):
+        print(f"\r{rows} baris, {rows / seconds:.0f} baris/detik", end='', file=sys.stderr, flush=True)
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', newline='', encoding='utf-8')
+    try:
+        summary = rescore(args.data, out, args.model, args.workers, int(args.chunk_mb * 2**20), args.lookup,
+                          args.keep_columns, None if args.quiet else progress)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{summary['rows']} baris ({summary['incomplete']} tidak lengkap) dalam {summary['seconds']:.1f} detik, "
+          f"{summary['rows_per_second']:.0f} baris/detik dengan {summary['workers']} proses", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
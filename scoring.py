@@ -0,0 +1,82 @@
+import joblib
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Batas memori (byte) untuk array selisih sementara per blok baris
+BLOCK_BYTES = 32 * 1024 * 1024
+# Jumlah titik rep minimal sebelum backend 'auto' memakai KD-tree
+KDTREE_MIN_REPS = 1024
+
+
+# Indeks titik rep terdekat: semua titik rep disusun jadi satu array
+# kontigu dengan array id klaster paralel, dibangun sekali saat model dimuat.
+# Hasil assign identik dengan loop per klaster (np.linalg.norm lalu argmin,
+# jika seri ambil klaster dengan nomor terkecil).
+class RepIndex:
+    def __init__(self, reps, cluster_ids, backend='auto', candidates=8):
+        self.reps = reps
+        self.cluster_ids = np.asarray(cluster_ids)
+        self.num_clusters = len(np.unique(self.cluster_ids))
+
+        if backend == 'auto':
+            backend = 'kdtree' if len(self.reps) >= KDTREE_MIN_REPS else 'brute'
+        if backend not in ('brute', 'kdtree'):
+            raise ValueError(f"backend tidak dikenal: {backend}")
+        self.backend = backend
+        self.candidates = min(candidates, len(self.reps))
+        self.tree = cKDTree(self.reps) if backend == 'kdtree' else None
+
+    # dari list titik rep per klaster (format cure_model.pkl)
+    @classmethod
+    def from_rep_points(cls, rep_points, **kwargs):
+        reps = np.ascontiguousarray(np.vstack(rep_points))
+        cluster_ids = np.repeat(np.arange(1, len(rep_points) + 1), [len(reps) for reps in rep_points])
+        return cls(reps, cluster_ids, **kwargs)
+
+    def __repr__(self):
+        return f"RepIndex({self.num_clusters} klaster, {len(self.reps)} titik rep, {self.backend})"
+
+    # nomor klaster (1..k) untuk setiap baris data yang sudah di-scale
+    def assign(self, data_scaled):
+        data_scaled = np.atleast_2d(np.asarray(data_scaled, dtype=np.float64))
+        if self.tree is None:
+            return self.cluster_ids[self._nearest_brute(data_scaled)]
+        return self.cluster_ids[self._nearest_tree(data_scaled)]
+
+    def _nearest_brute(self, data_scaled):
+        nearest = np.empty(len(data_scaled), dtype=np.intp)
+        block_rows = max(1, BLOCK_BYTES // (8 * self.reps.size))
+        for start in range(0, len(data_scaled), block_rows):
+            block = data_scaled[start:start + block_rows]
+            dist = np.linalg.norm(block[:, None, :] - self.reps[None, :, :], axis=2)
+            nearest[start:start + block_rows] = dist.argmin(axis=1)
+        return nearest
+
+    def _nearest_tree(self, data_scaled):
+        nearest = np.empty(len(data_scaled), dtype=np.intp)
+        block_rows = max(1, BLOCK_BYTES // (8 * self.candidates * self.reps.shape[1]))
+        for start in range(0, len(data_scaled), block_rows):
+            block = data_scaled[start:start + block_rows]
+            nearest[start:start + block_rows] = self._nearest_tree_block(block)
+        return nearest
+
+    def _nearest_tree_block(self, data_scaled):
+        _, idx = self.tree.query(data_scaled, k=self.candidates)
+        idx = idx.reshape(len(data_scaled), -1)
+
+        # hitung ulang jarak kandidat dengan rumus yang sama seperti brute force
+        dist = np.linalg.norm(data_scaled[:, None, :] - self.reps[idx], axis=2)
+        best = dist.min(axis=1)
+        nearest = np.where(dist == best[:, None], idx, len(self.reps)).min(axis=1)
+
+        # jika kandidat terjauh masih seri dengan yang terdekat, mungkin ada titik
+        # rep lain yang sama dekat di luar kandidat: cek ulang dengan brute force
+        if self.candidates < len(self.reps):
+            ambiguous = dist.max(axis=1) <= best * (1 + 1e-9)
+            if ambiguous.any():
+                nearest[ambiguous] = self._nearest_brute(data_scaled[ambiguous])
+        return nearest
+
+
+def load_rep_index(filename='cure_model.pkl', backend='auto'):
+    return RepIndex.from_rep_points(joblib.load(filename), backend=backend)
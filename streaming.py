@@ -0,0 +1,151 @@
+# Preprocessing dan scaling bertahap (per chunk) untuk arsip skrining yang
+# tidak muat di memori. Hasilnya sama dengan langkah di cure.ipynb:
+#   data.fillna(data.mean()) lalu StandardScaler().fit_transform(...)
+#
+# Pass 1 (compute_statistics): mean per kolom (untuk imputasi) dan statistik
+#   scaler dihitung sekaligus dengan akumulator Welford/Chan per chunk.
+# Pass 2 (write_scaled): data di-impute dan di-scale lalu ditulis sebagai
+#   float32 ke file .npy yang dibaca kembali dengan np.load(mmap_mode='r').
+#
+#   python streaming.py [data.csv] [scaled_data.npy] [--chunksize 100000]
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from artifacts import replace_file
+from preprocessing import FEATURES, preprocess_data
+
+CHUNKSIZE = 100_000
+
+
+class RunningStats:
+    def __init__(self, features=FEATURES):
+        self.features = list(features)
+        self.rows = 0
+        self.count = np.zeros(len(self.features))  # jumlah nilai tidak kosong per kolom
+        self.mean = np.zeros(len(self.features))
+        self.m2 = np.zeros(len(self.features))
+
+    # gabungkan statistik satu chunk (nilai NaN diabaikan) ke akumulator
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        valid = ~np.isnan(chunk)
+        count_b = valid.sum(axis=0)
+        sum_b = np.where(valid, chunk, 0).sum(axis=0)
+        mean_b = np.divide(sum_b, count_b, out=np.zeros_like(sum_b), where=count_b > 0)
+        m2_b = np.square(np.where(valid, chunk - mean_b, 0)).sum(axis=0)
+
+        count = self.count + count_b
+        delta = mean_b - self.mean
+        weight = np.divide(count_b, count, out=np.zeros_like(sum_b), where=count > 0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.count * weight
+        self.count = count
+        self.rows += len(chunk)
+
+    # varians setelah nilai kosong diisi mean: nilai isian tidak menambah m2,
+    # tetapi ikut dihitung sebagai sampel (sama dengan fillna lalu StandardScaler.fit)
+    @property
+    def var(self):
+        return self.m2 / self.rows
+
+    @property
+    def scale(self):
+        scale = np.sqrt(self.var)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0  # seperti StandardScaler untuk kolom konstan
+        return scale
+
+    @property
+    def missing(self):
+        return dict(zip(self.features, (self.rows - self.count).astype(int).tolist()))
+
+    def __repr__(self):
+        return f"RunningStats({self.rows} baris, {len(self.features)} fitur)"
+
+
+def read_chunks(filename, chunksize=CHUNKSIZE, errors='raise'):
+    for chunk in pd.read_csv(filename, chunksize=chunksize, usecols=FEATURES):
+        yield preprocess_data(chunk, errors=errors)[FEATURES].to_numpy(dtype=np.float64)
+
+
+def compute_statistics(filename, chunksize=CHUNKSIZE, errors='raise'):
+    stats = RunningStats()
+    for chunk in read_chunks(filename, chunksize, errors):
+        stats.update(chunk)
+    if (stats.count == 0).any():
+        kosong = [kolom for kolom, n in zip(stats.features, stats.count) if n == 0]
+        raise ValueError(f"Kolom tanpa nilai sama sekali: {', '.join(kosong)}")
+    return stats
+
+
+# StandardScaler yang setara, untuk scaler.pkl dan save_bundle
+def to_scaler(stats):
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler()
+    scaler.mean_ = stats.mean.copy()
+    scaler.var_ = stats.var
+    scaler.scale_ = stats.scale
+    scaler.n_samples_seen_ = stats.rows
+    scaler.n_features_in_ = len(stats.features)
+    scaler.feature_names_in_ = np.array(stats.features, dtype=object)
+    return scaler
+
+
+# Tulis data ter-scale (float32) ke .npy per chunk, lalu kembalikan sebagai memmap read-only.
+# Di Windows out_filename tidak bisa ditimpa selama masih ada memmap lama yang terbuka
+# (lihat artifacts.replace_file).
+def write_scaled(filename, out_filename, stats, chunksize=CHUNKSIZE, errors='raise', dtype=np.float32):
+    directory = os.path.dirname(os.path.abspath(out_filename))
+    fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.npy')
+    os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(tmp_name, mode='w+', dtype=dtype, shape=(stats.rows, len(stats.features)))
+        start = 0
+        scale = stats.scale
+        for chunk in read_chunks(filename, chunksize, errors):
+            if start + len(chunk) > stats.rows:
+                raise ValueError(f"{filename} berubah sejak statistik dihitung")
+            chunk = np.where(np.isnan(chunk), stats.mean, chunk)
+            out[start:start + len(chunk)] = (chunk - stats.mean) / scale
+            start += len(chunk)
+        if start != stats.rows:
+            raise ValueError(f"{filename} berubah sejak statistik dihitung")
+        out.flush()
+        del out
+        os.chmod(tmp_name, 0o644)
+        replace_file(tmp_name, out_filename)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return load_scaled(out_filename)
+
+
+def load_scaled(filename='scaled_data.npy'):
+    return np.load(filename, mmap_mode='r')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocessing dan scaling data skrining per chunk")
+    parser.add_argument('data', nargs='?', default='data.csv')
+    parser.add_argument('out', nargs='?', default='scaled_data.npy')
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    parser.add_argument('--scaler', help="simpan StandardScaler yang setara ke file ini (joblib)")
+    args = parser.parse_args()
+
+    stats = compute_statistics(args.data, args.chunksize)
+    scaled = write_scaled(args.data, args.out, stats, args.chunksize)
+    print(f"{stats}: nilai kosong {stats.missing}")
+    print(f"{args.out}: {scaled.shape} {scaled.dtype}")
+    if args.scaler:
+        import joblib
+
+        joblib.dump(to_scaler(stats), args.scaler)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# Status HTTP api.py: 200/400/404/413/422/500 lewat server lokal
+import http.client
+import json
+import logging
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import api
+import metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORD = {
+    'Nama': 'Lansia', 'Umur': 70, 'Jenis_Kelamin': 'Laki-laki', 'Berat_Badan': 60, 'Tinggi_Badan': 160,
+    'Penurunan_Berat_Badan': 1, 'Frekuensi_Makan': 'Dua kali',
+    'Variasi_Makanan': 'Makanan terbatas pada beberapa jenis saja', 'Asupan_Protein': 'Sekali sehari',
+    'Mobilitas': 'Bergerak dengan bantuan', 'Aktivitas_Sehari_hari': 'Kesulitan ringan',
+    'Kesehatan_Mulut': 'Tidak ada masalah', 'Penyakit_Kronis': 'Ya', 'Stres': 'Tidak',
+    'Masalah_Kognitif': 'Tidak ada masalah daya ingat',
+}
+
+
+class Handler(api.ScoringHandler):
+    model_file = os.path.join(ROOT, 'cure_model.bundle')
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+
+
+def request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=30)
+    if body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+    conn.request(method, path, body, headers or {})
+    response = conn.getresponse()
+    status, payload = response.status, response.read()
+    conn.close()
+    if response.getheader('Content-Type', '').startswith('application/json'):
+        payload = json.loads(payload)
+    return status, payload
+
+
+def test_score_and_health(server):
+    status, body = request(server, 'POST', '/score', RECORD)
+    assert status == 200 and body['nama'] == 'Lansia' and body['label']
+    status, body = request(server, 'GET', '/health?verbose=1')
+    assert status == 200 and body['status'] == 'ok'
+    status, body = request(server, 'POST', '/score/batch?x=1', {'records': [RECORD, {**RECORD, 'Umur': None}]})
+    assert status == 200 and [r['cluster'] is None for r in body['results']] == [False, True]
+
+
+@pytest.mark.parametrize('path, body', [
+    ('/score', b'{bukan json'),
+    ('/score', [RECORD]),
+    ('/score', {**RECORD, 'Umur': [70]}),
+    ('/score', {'Nama': 'Lansia'}),
+    ('/score/batch', {'records': RECORD}),
+])
+def test_bad_request(server, path, body):
+    status, payload = request(server, 'POST', path, body)
+    assert status == 400 and payload['error']
+    assert metrics.snapshot()['counters'] == {'api_errors_400': 1}
+
+
+def test_bad_content_length(server):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=30)
+    conn.putrequest('POST', '/score')
+    conn.putheader('Content-Length', 'abc')
+    conn.endheaders()
+    assert conn.getresponse().status == 400
+    conn.close()
+
+
+def test_not_found(server):
+    assert request(server, 'GET', '/tidak-ada')[0] == 404
+    assert request(server, 'POST', '/tidak-ada', {})[0] == 404
+    assert request(server, 'POST', '/health', {})[0] == 404
+
+
+def test_too_large(server, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_BATCH_RECORDS', 2)
+    status, _ = request(server, 'POST', '/score/batch', {'records': [RECORD] * 3})
+    assert status == 413
+
+
+@pytest.mark.parametrize('kolom, nilai', [
+    ('Jenis_Kelamin', 'Pria'),
+    ('Umur', True),
+    ('Berat_Badan', 'inf'),
+])
+def test_unprocessable(server, kolom, nilai):
+    status, body = request(server, 'POST', '/score', {**RECORD, kolom: nilai})
+    assert status == 422 and kolom in body['unknown']
+
+
+def test_overflowing_number(server):
+    body = json.dumps({**RECORD, 'Umur': 0}).replace('"Umur": 0', '"Umur": 1e400').encode('utf-8')
+    status, body = request(server, 'POST', '/score', body)
+    assert status == 422 and body['unknown'] == {'Umur': ['inf']}
+
+
+def test_unexpected_error(server, monkeypatch):
+    monkeypatch.setattr(Handler, 'model_file', os.path.join(ROOT, 'tidak-ada.bundle'))
+    logging.disable(logging.CRITICAL)
+    try:
+        status, body = request(server, 'POST', '/score', RECORD)
+    finally:
+        logging.disable(logging.NOTSET)
+    assert status == 500 and body == {'error': "Terjadi kesalahan di server"}
+    assert metrics.snapshot()['counters'] == {'api_errors_500': 1}
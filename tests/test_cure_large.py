@@ -0,0 +1,62 @@
+# runCURELarge + labelData dibandingkan dengan runCURE pada data.csv
+import os
+
+import numpy as np
+import pytest
+
+import reference
+from bundle import CLUSTER_LABELS, load_bundle, match_cluster_labels
+from cure import labelData, runCURE, runCURELarge
+from streaming import load_scaled
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUM_REP_POINTS = 5
+ALPHA = 0.3
+NUM_CLUSTERS = 3
+
+
+@pytest.fixture(scope='module')
+def scaled_data():
+    return np.asarray(load_scaled(os.path.join(ROOT, 'scaled_data.npy')))
+
+
+@pytest.fixture(scope='module')
+def cure_labels(scaled_data):
+    return runCURE(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)[1]
+
+
+def _partition(labels):
+    return sorted(tuple(np.flatnonzero(labels == c)) for c in np.unique(labels))
+
+
+def test_full_sample_matches_runcure(scaled_data, cure_labels):
+    clusters = runCURELarge(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, sampleSize=len(scaled_data), seed=0)
+    labels = np.zeros(len(scaled_data), dtype=int)
+    for i, cluster in enumerate(clusters):
+        labels[cluster.index] = i + 1
+    assert np.array_equal(labels, cure_labels)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_sampled_partition_and_labels(scaled_data, cure_labels, seed):
+    clusters = runCURELarge(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, sampleSize=200, seed=seed)
+    labels = labelData(scaled_data, [cluster.repPoints for cluster in clusters])
+    assert _partition(labels) == _partition(cure_labels)
+
+    # nomor klaster bisa tertukar, tapi label dari model yang di-deploy tetap benar
+    model = load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+    cluster_labels = match_cluster_labels(scaled_data, labels, model)
+    assert sorted(cluster_labels.values()) == sorted(CLUSTER_LABELS.values())
+    assert [cluster_labels[c] for c in labels] == [CLUSTER_LABELS[c] for c in cure_labels]
+
+
+def test_label_data_matches_reference(scaled_data):
+    model = load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+    rep_points = [np.asarray(reps, dtype=np.float64) for reps in model.rep_points]
+    expected = [reference.detect_new_data(row, rep_points) for row in scaled_data]
+    assert np.array_equal(labelData(scaled_data, rep_points, memoryBudget=4096), expected)
+
+
+def test_memory_budget_too_small(scaled_data):
+    with pytest.raises(ValueError):
+        runCURELarge(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, sampleSize=517, memoryBudget=20000)
@@ -0,0 +1,96 @@
+# incremental.update_clusters / CureCluster.addPoints: running mean dan ambang drift
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bundle import load_bundle
+from cure import CureCluster
+from incremental import append_pending, init_state, update_clusters
+from preprocessing import FEATURES
+from streaming import load_scaled
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def scaled_data():
+    return np.asarray(load_scaled(os.path.join(ROOT, 'scaled_data.npy')))
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+
+
+@pytest.fixture
+def clusters(scaled_data, model):
+    return init_state(scaled_data, model.rep_points)
+
+
+def _cluster(points):
+    cluster = CureCluster(0, points[0])
+    for i, point in enumerate(points[1:], start=1):
+        cluster.mergeWithCluster(CureCluster(i, point), 3, 0.3)
+    return cluster
+
+
+def test_init_state_keeps_deployed_reps(clusters, model):
+    assert [len(cluster.index) for cluster in clusters] == [155, 119, 243]
+    for cluster, reps in zip(clusters, model.rep_points):
+        assert np.array_equal(cluster.repPoints, reps)
+        assert cluster.drift() == 0
+
+
+def test_add_points_running_mean():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(30, 4))
+    cluster = _cluster(points[:10])
+    reps = cluster.repPoints.copy()
+    assert not cluster.addPoints(points[10:12], [10, 11], 3, 0.3, driftThreshold=np.inf)
+    assert cluster.addPoints(points[12:], np.arange(12, 30), 3, 0.3, driftThreshold=0)
+    assert np.allclose(cluster.center, points.mean(axis=0), rtol=0, atol=1e-12)
+    assert np.array_equal(cluster.points, points) and list(cluster.index) == list(range(30))
+    assert not np.array_equal(cluster.repPoints, reps)
+    assert cluster.drift() == 0
+
+
+def test_add_points_drift_threshold():
+    cluster = _cluster(np.array([[0.0, 0.0], [2.0, 0.0], [0.0, 2.0], [2.0, 2.0]]))
+    reps = cluster.repPoints.copy()
+    # pusat bergeser dari (1, 1) ke (1.2, 1); rata-rata jarak rep ke pusat 0.7 * sqrt(2)
+    drift = 0.2 / (0.7 * np.sqrt(2))
+    assert not cluster.addPoints([[2.0, 1.0]], [4], 3, 0.3, driftThreshold=drift + 1e-9)
+    assert np.array_equal(cluster.repPoints, reps)
+    assert cluster.drift() == pytest.approx(drift)
+    # titik tepat di pusat: drift tetap, tapi kini di atas ambang
+    assert cluster.addPoints([[1.2, 1.0]], [5], 3, 0.3, driftThreshold=drift - 1e-9)
+    assert cluster.drift() == 0
+
+
+def test_update_clusters(clusters, scaled_data, model):
+    new = scaled_data[:40] + 0.01
+    assigned, regenerated = update_clusters(clusters, new, drift_threshold=np.inf)
+    assert np.array_equal(assigned, model.assign(new))
+    assert regenerated == []
+    for cluster_id, cluster in enumerate(clusters, start=1):
+        assert np.array_equal(cluster.repPoints, model.rep_points[cluster_id - 1])
+        added = np.flatnonzero(assigned == cluster_id)
+        assert list(cluster.index[-len(added):]) == list(517 + added)
+        assert np.allclose(cluster.center, cluster.points.mean(axis=0), rtol=0, atol=1e-12)
+
+    # data jauh dari pusat klaster 1 -> hanya klaster 1 yang titik rep-nya dihitung ulang
+    far = np.tile(clusters[0].repPoints[:1] * 4, (300, 1))
+    assigned, regenerated = update_clusters(clusters, far)
+    assert set(assigned) == {1} and regenerated == [1]
+    assert clusters[0].drift() == 0
+
+
+def test_append_pending_without_names(tmp_path):
+    data = pd.read_csv(os.path.join(ROOT, 'data.csv')).head(2)
+    filename = tmp_path / 'data_baru.csv'
+    append_pending(data, filename)
+    append_pending(data, filename)
+    saved = pd.read_csv(filename)
+    assert list(saved.columns) == FEATURES and len(saved) == 4
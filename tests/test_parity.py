@@ -0,0 +1,96 @@
+# Hasil versi yang sudah dioptimasi harus sama persis dengan implementasi awal
+# (benchmarks/reference.py) pada data.csv dan pada data sintetis yang banyak seri.
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import reference
+from bundle import load_bundle
+from cure import labelsFromDendrogram, runCURE, runCUREDendrogram
+from lookup import LookupScorer
+from preprocessing import FEATURES, preprocess_data
+from streaming import load_scaled
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUM_REP_POINTS = 5
+ALPHA = 0.3
+NUM_CLUSTERS = 3
+
+
+@pytest.fixture(scope='module')
+def scaled_data():
+    return np.asarray(load_scaled(os.path.join(ROOT, 'scaled_data.npy')))
+
+
+# titik di grid kasar dengan banyak duplikat, jadi banyak jarak yang seri
+@pytest.fixture(scope='module')
+def tie_data():
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 3, (60, 4)).astype(np.float64)
+    return np.concatenate([data, data[:20]])
+
+
+@pytest.fixture(scope='module')
+def raw_data():
+    return pd.read_csv(os.path.join(ROOT, 'data.csv'))
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_bundle(os.path.join(ROOT, 'cure_model.bundle'))
+
+
+def test_runcure_matches_reference(scaled_data):
+    _, labels = runCURE(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+    _, ref_labels = reference.runCURE(scaled_data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+    assert np.array_equal(labels, ref_labels)
+    assert np.bincount(labels)[1:].tolist() == [155, 119, 243]
+
+
+@pytest.mark.parametrize('num_cluster', [1, 3, 7])
+def test_runcure_matches_reference_with_ties(tie_data, num_cluster):
+    _, labels = runCURE(tie_data, NUM_REP_POINTS, ALPHA, num_cluster, dtype=np.float64)
+    _, ref_labels = reference.runCURE(tie_data, NUM_REP_POINTS, ALPHA, num_cluster)
+    assert np.array_equal(labels, ref_labels)
+
+
+@pytest.mark.parametrize('dataset', ['scaled_data', 'tie_data'])
+def test_dendrogram_matches_runcure(request, dataset):
+    data = request.getfixturevalue(dataset)
+    merges = runCUREDendrogram(data, NUM_REP_POINTS, ALPHA, dtype=np.float64)
+    for num_cluster in [1, 2, 3, 5, 10]:
+        _, labels = runCURE(data, NUM_REP_POINTS, ALPHA, num_cluster, dtype=np.float64)
+        assert np.array_equal(labelsFromDendrogram(merges, len(data), num_cluster), labels)
+
+
+@pytest.mark.parametrize('dataset', ['scaled_data', 'tie_data'])
+def test_index_matches_exact(request, dataset):
+    data = request.getfixturevalue(dataset)
+    _, labels = runCURE(data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS)
+    _, index_labels = runCURE(data, NUM_REP_POINTS, ALPHA, NUM_CLUSTERS, useIndex=True)
+    assert np.array_equal(index_labels, labels)
+
+
+def test_transform_matches_scaler(raw_data, model):
+    encoded = preprocess_data(raw_data)
+    scaler = joblib.load(os.path.join(ROOT, 'scaler.pkl'))
+    expected = scaler.transform(reference.preprocess_data(raw_data.copy())[FEATURES])
+    assert np.array_equal(model.transform(encoded), expected)
+
+
+def test_assign_matches_reference(scaled_data, model):
+    rep_points = joblib.load(os.path.join(ROOT, 'cure_model.pkl'))
+    expected = [reference.detect_new_data(row, rep_points) for row in scaled_data]
+    assert np.array_equal(model.assign(scaled_data), expected)
+
+
+def test_lookup_matches_assign(raw_data, model):
+    encoded = preprocess_data(raw_data)
+    # baris kembar dan nilai di luar CONTINUOUS_BOUNDS ikut diuji
+    encoded = pd.concat([encoded, encoded.iloc[:50]], ignore_index=True)
+    encoded.loc[:9, 'Berat_Badan'] = 250
+    expected = model.assign(model.transform(encoded))
+    assert np.array_equal(LookupScorer(model).assign(encoded), expected)
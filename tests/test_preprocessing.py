@@ -0,0 +1,71 @@
+# encode/preprocess_data: nilai yang tidak dikenal dilaporkan, bukan diberi klaster
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bundle import load_bundle
+from detection import score_batch
+from preprocessing import FEATURES, UnknownCategoryError, encode, preprocess_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def raw_data():
+    return pd.read_csv(os.path.join(ROOT, 'data.csv')).head(5)
+
+
+def test_encode_known_values(raw_data):
+    encoded, unknown = encode(raw_data)
+    assert unknown == {}
+    assert list(encoded.columns) == FEATURES
+    assert encoded.notna().all().all()
+
+
+def test_encode_strips_and_reports_unknown(raw_data):
+    data = raw_data.astype(object)
+    data.loc[0, 'Stres'] = '  Ya '
+    data.loc[1, 'Frekuensi_Makan'] = 'dua kali'
+    data.loc[2, 'Umur'] = 'tujuh puluh'
+    data.loc[3, 'Mobilitas'] = None
+    encoded, unknown = encode(data)
+    assert encoded.loc[0, 'Stres'] == 1
+    assert unknown == {'Umur': ['tujuh puluh'], 'Frekuensi_Makan': ['dua kali']}
+    assert encoded.loc[[1, 2, 3]].isna().any(axis=1).all()
+    assert encoded.loc[[0, 4]].notna().all().all()
+
+
+def test_encode_rejects_non_finite_and_boolean(raw_data):
+    data = raw_data.astype(object)
+    data.loc[0, 'Umur'] = 'inf'
+    data.loc[1, 'Berat_Badan'] = -np.inf
+    data.loc[2, 'Tinggi_Badan'] = '1e400'
+    data.loc[3, 'Penurunan_Berat_Badan'] = True
+    encoded, unknown = encode(data)
+    assert unknown == {'Umur': ['inf'], 'Berat_Badan': [-np.inf], 'Tinggi_Badan': ['1e400'],
+                       'Penurunan_Berat_Badan': [True]}
+    assert encoded.loc[:3].isna().any(axis=1).all()
+    # input tidak ikut diubah
+    assert data.loc[1, 'Berat_Badan'] == -np.inf
+
+
+def test_preprocess_data_raises_unknown_category(raw_data):
+    data = raw_data.copy()
+    data.loc[0, 'Jenis_Kelamin'] = 'Pria'
+    with pytest.raises(UnknownCategoryError) as excinfo:
+        preprocess_data(data)
+    assert excinfo.value.unknown == {'Jenis_Kelamin': ['Pria']}
+    assert isinstance(excinfo.value, ValueError)
+    assert np.isnan(preprocess_data(data, errors='ignore').loc[0, 'Jenis_Kelamin'])
+
+
+def test_score_batch_leaves_invalid_rows_unscored(raw_data):
+    data = raw_data.astype(object)
+    data.loc[0, 'Umur'] = 'inf'
+    data.loc[1, 'Berat_Badan'] = 'abc'
+    hasil, unknown = score_batch(data, load_bundle(os.path.join(ROOT, 'cure_model.bundle')))
+    assert hasil['Klaster'].isna().tolist() == [True, True, False, False, False]
+    assert hasil['Status'].isna().tolist() == [True, True, False, False, False]
+    assert unknown == {'Umur': ['inf'], 'Berat_Badan': ['abc']}
@@ -0,0 +1,72 @@
+# rescore (per potongan byte, beberapa proses) dibandingkan dengan detection.score_batch
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from bundle import load_bundle
+from detection import score_batch
+from rescore import byte_ranges, rescore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLE = os.path.join(ROOT, 'cure_model.bundle')
+
+
+@pytest.fixture(scope='module')
+def data():
+    data = pd.read_csv(os.path.join(ROOT, 'data.csv'))
+    data = pd.concat([data] * 4, ignore_index=True).astype(object)
+    data.loc[3, 'Umur'] = None
+    data.loc[5, 'Stres'] = 'Mungkin'
+    data.loc[7, 'Berat_Badan'] = 'inf'
+    return data
+
+
+@pytest.fixture(scope='module')
+def expected(data):
+    hasil, _ = score_batch(data, load_bundle(BUNDLE))
+    return hasil
+
+
+def _rescore(filename, **kwargs):
+    out = io.StringIO()
+    summary = rescore(filename, out, BUNDLE, **kwargs)
+    out.seek(0)
+    return pd.read_csv(out, dtype={'Nama': str}), summary
+
+
+@pytest.mark.parametrize('workers, use_lookup', [(1, True), (1, False), (2, True)])
+def test_rescore_matches_score_batch(data, expected, tmp_path, workers, use_lookup):
+    filename = tmp_path / 'registri.csv'
+    data.to_csv(filename, index=False)
+    hasil, summary = _rescore(filename, workers=workers, chunk_bytes=4096, use_lookup=use_lookup)
+    assert list(hasil.columns) == ['Nama', 'Klaster', 'Status']
+    assert hasil['Nama'].tolist() == expected['Nama'].tolist()
+    assert hasil['Klaster'].astype('Int64').tolist() == expected['Klaster'].tolist()
+    assert hasil['Status'].fillna('').tolist() == expected['Status'].fillna('').tolist()
+    assert summary['rows'] == len(data) and summary['incomplete'] == 3
+
+
+def test_byte_ranges_cover_file(data, tmp_path):
+    filename = tmp_path / 'registri.csv'
+    data.to_csv(filename, index=False)
+    ranges = list(byte_ranges(filename, 1000))
+    raw = filename.read_bytes()
+    assert ranges[0][0] == raw.index(b'\n') + 1 and ranges[-1][1] == len(raw)
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+    assert all(raw[stop - 1:stop] == b'\n' for _, stop in ranges)
+
+
+def test_rescore_excel_csv_with_bom(data, expected, tmp_path):
+    filename = tmp_path / 'registri.csv'
+    data.to_csv(filename, index=False, encoding='utf-8-sig')
+    hasil, _ = _rescore(filename, workers=1)
+    assert hasil['Klaster'].astype('Int64').tolist() == expected['Klaster'].tolist()
+
+
+def test_rescore_missing_column(data, tmp_path):
+    filename = tmp_path / 'registri.csv'
+    data.drop(columns=['Stres']).to_csv(filename, index=False)
+    with pytest.raises(ValueError, match='Stres'):
+        rescore(filename, io.StringIO(), BUNDLE, workers=1)
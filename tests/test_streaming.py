@@ -0,0 +1,78 @@
+# RunningStats/write_scaled per chunk dibandingkan dengan langkah notebook:
+# data.fillna(data.mean()) lalu StandardScaler().fit_transform(...)
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+import artifacts
+from preprocessing import FEATURES, preprocess_data
+from streaming import RunningStats, compute_statistics, to_scaler, write_scaled
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# data.csv dengan sebagian nilai dikosongkan dan skala kolom yang berbeda jauh
+@pytest.fixture(scope='module')
+def data_file(tmp_path_factory):
+    data = pd.read_csv(os.path.join(ROOT, 'data.csv'))
+    rng = np.random.default_rng(0)
+    for kolom in ['Umur', 'Berat_Badan', 'Stres', 'Mobilitas']:
+        data.loc[rng.random(len(data)) < 0.1, kolom] = None
+    data['Tinggi_Badan'] = data['Tinggi_Badan'] * 1e6
+    filename = tmp_path_factory.mktemp('data') / 'data.csv'
+    data.to_csv(filename, index=False)
+    return filename
+
+
+@pytest.fixture(scope='module')
+def expected(data_file):
+    data = preprocess_data(pd.read_csv(data_file))[FEATURES]
+    data = data.fillna(data.mean())
+    scaler = StandardScaler().fit(data)
+    return scaler, scaler.transform(data)
+
+
+@pytest.mark.parametrize('chunksize', [1, 37, 100, 10_000])
+def test_statistics_match_scaler(data_file, expected, chunksize):
+    scaler, _ = expected
+    stats = compute_statistics(data_file, chunksize)
+    assert stats.rows == scaler.n_samples_seen_
+    np.testing.assert_allclose(stats.mean, scaler.mean_, rtol=1e-13)
+    np.testing.assert_allclose(stats.var, scaler.var_, rtol=1e-13)
+    np.testing.assert_allclose(to_scaler(stats).scale_, scaler.scale_, rtol=1e-13)
+    assert stats.missing['Tinggi_Badan'] == 0 and stats.missing['Umur'] > 0
+
+
+@pytest.mark.parametrize('chunksize', [37, 10_000])
+def test_write_scaled_matches_fit_transform(data_file, expected, tmp_path, chunksize):
+    out = tmp_path / 'scaled_data.npy'
+    scaled = write_scaled(data_file, out, compute_statistics(data_file, chunksize), chunksize, dtype=np.float64)
+    assert isinstance(scaled, np.memmap)
+    np.testing.assert_allclose(scaled, expected[1], rtol=1e-13, atol=1e-13)
+    assert sorted(os.listdir(tmp_path)) == ['scaled_data.npy']
+
+
+def test_empty_chunks_and_constant_column():
+    stats = RunningStats(['a', 'b'])
+    stats.update(np.empty((0, 2)))
+    stats.update([[1.0, np.nan], [1.0, 2.0]])
+    stats.update([[1.0, np.nan]])
+    assert stats.rows == 3 and stats.missing == {'a': 0, 'b': 2}
+    np.testing.assert_allclose(stats.mean, [1.0, 2.0])
+    np.testing.assert_allclose(stats.scale, [1.0, 1.0])
+
+
+def test_replace_locked_file_gives_clear_error(tmp_path, monkeypatch):
+    def replace(src, dst):
+        error = OSError(22, "The requested operation cannot be performed on a file with a user-mapped section open")
+        error.winerror = 1224
+        raise error
+
+    tmp_name = tmp_path / 'tmp.npy'
+    tmp_name.write_bytes(b'')
+    monkeypatch.setattr(artifacts.os, 'replace', replace)
+    with pytest.raises(PermissionError, match='scaled_data.npy'):
+        artifacts.replace_file(tmp_name, 'scaled_data.npy')
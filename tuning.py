@@ -0,0 +1,64 @@
+# Pemilihan jumlah klaster (k) dan parameter CURE untuk notebook.
+#
+# Satu run CURE per pasangan (numRepPoints, alpha) menghasilkan dendrogram yang
+# melewati setiap k, jadi label untuk semua k diambil dari satu run tersebut.
+# Silhouette dan Davies-Bouldin dihitung paralel (joblib, proses terpisah) dengan
+# satu matriks jarak yang sama; joblib memetakan array besar ke worker lewat
+# memmap sehingga matriks tidak disalin per tugas.
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.spatial.distance import cdist
+from sklearn.metrics import davies_bouldin_score, silhouette_score
+
+from cure import labelsFromDendrogram, runCUREDendrogram
+
+
+def pairwise_distances(data):
+    data = np.asarray(data, dtype=np.float64)
+    return cdist(data, data, 'euclidean')
+
+
+def score_labels(distances, data, labels):
+    return {
+        'silhouette': silhouette_score(distances, labels, metric='precomputed'),
+        'davies_bouldin': davies_bouldin_score(data, labels),
+    }
+
+
+def _dendrogram(data, num_rep_points, alpha, min_cluster):
+    return num_rep_points, alpha, runCUREDendrogram(data, num_rep_points, alpha, min_cluster)
+
+
+def _score_params(distances, data, merges, num_rep_points, alpha, k):
+    labels = labelsFromDendrogram(merges, len(data), k)
+    return {'num_rep_points': num_rep_points, 'alpha': alpha, 'k': k, **score_labels(distances, data, labels)}
+
+
+# Skor untuk setiap kombinasi numRepPoints x alpha x k. Dendrogram tiap
+# pasangan parameter dijalankan paralel, lalu semua pasangan (parameter, k)
+# dinilai paralel terhadap matriks jarak bersama.
+def grid_search(data, num_rep_points_grid=(5,), alpha_grid=(0.3,), k_range=range(2, 11), n_jobs=-1, distances=None):
+    data = np.asarray(data, dtype=np.float64)
+    k_range = list(k_range)
+    if min(k_range) < 2 or max(k_range) >= len(data):
+        raise ValueError("k harus di antara 2 dan jumlah data - 1")
+    if distances is None:
+        distances = pairwise_distances(data)
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        dendrograms = parallel(
+            delayed(_dendrogram)(data, num_rep_points, alpha, min(k_range))
+            for num_rep_points in num_rep_points_grid for alpha in alpha_grid
+        )
+        scores = parallel(
+            delayed(_score_params)(distances, data, merges, num_rep_points, alpha, k)
+            for num_rep_points, alpha, merges in dendrograms for k in k_range
+        )
+    return pd.DataFrame(scores)
+
+
+# Silhouette/Davies-Bouldin untuk setiap k dari satu run CURE
+def sweep_k(data, num_rep_points=5, alpha=0.3, k_range=range(2, 11), n_jobs=-1, distances=None):
+    scores = grid_search(data, [num_rep_points], [alpha], k_range, n_jobs, distances)
+    return scores.drop(columns=['num_rep_points', 'alpha'])